@@ -0,0 +1 @@
+"""Data access and analytics shared by the Streamlit pages and merge scripts."""
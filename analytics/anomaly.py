@@ -0,0 +1,281 @@
+"""Incremental surge detection on per-district daily update load.
+
+:class:`SurgeDetector` keeps a small running state per district and is fed
+one day at a time. Each update is a handful of vector operations over all
+districts, with constant work per district whatever the length of the
+history:
+
+- robust z-score: distance of today's load from the median of the last
+  ``window`` days, in units of their scaled median absolute deviation (kept
+  in a ring buffer)
+- EWMA control chart: today's load against an exponentially weighted mean
+  and variance
+- CUSUM: one-sided cumulative sum of the EWMA-standardised excess, which
+  catches smaller shifts that persist over several days
+
+A district is flagged on a day when any detector crosses its threshold,
+after a warm-up period. The state is saved between runs (see
+:func:`refresh`), so a new daily drop only processes the new days.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import warnings
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+STATE_DIR = Path(os.environ.get("AADHAAR_STATE_DIR", ".cache/state"))
+
+WINDOW = 28
+SMOOTHING = 0.2
+WARMUP = 14
+
+ROBUST_Z = 3.5
+EWMA_Z = 3.0
+CUSUM_SLACK = 0.5
+CUSUM_LIMIT = 5.0
+
+# Floor on the spread estimates, in updates, so near-constant series do not
+# turn small wobbles into huge scores
+MIN_SPREAD = 1.0
+
+MAD_SCALE = 1.4826
+
+ALERT_COLUMNS = [
+    "state", "district", "date", "Updates", "Expected",
+    "Robust_Z", "EWMA_Z", "CUSUM", "Detectors",
+]
+
+
+class SurgeDetector:
+    """Running surge statistics for a growing set of ``(state, district)`` keys."""
+
+    def __init__(self, window: int = WINDOW, smoothing: float = SMOOTHING):
+        self.window = window
+        self.smoothing = smoothing
+        self.keys: list[tuple[str, str]] = []
+        self._index: dict[tuple[str, str], int] = {}
+
+        self.buffer = np.full((0, window), np.nan)
+        self.position = 0
+        self.mean = np.zeros(0)
+        self.var = np.zeros(0)
+        self.cusum = np.zeros(0)
+        self.seen = np.zeros(0, dtype="int64")
+
+        self.last_day: pd.Timestamp | None = None
+        self.sources = ""           # fingerprint of the data last refreshed from
+        self.history = ""           # history_digest() of the days processed
+        self._alerts: list[pd.DataFrame] = []
+
+    # ===============================
+    # STATE
+    # ===============================
+    def _grow(self, keys) -> np.ndarray:
+        new = [k for k in keys if k not in self._index]
+        for key in new:
+            self._index[key] = len(self.keys)
+            self.keys.append(key)
+        if new:
+            n = len(new)
+            self.buffer = np.vstack([self.buffer, np.full((n, self.window), np.nan)])
+            self.mean = np.concatenate([self.mean, np.full(n, np.nan)])
+            self.var = np.concatenate([self.var, np.zeros(n)])
+            self.cusum = np.concatenate([self.cusum, np.zeros(n)])
+            self.seen = np.concatenate([self.seen, np.zeros(n, dtype="int64")])
+        return np.array([self._index[k] for k in keys], dtype="int64")
+
+    def update(self, day, loads: pd.Series) -> pd.DataFrame:
+        """Feed one day's load per ``(state, district)``; return its flagged rows.
+
+        Known districts missing from ``loads`` count as zero load that day.
+        """
+        day = pd.Timestamp(day)
+        if self.last_day is not None and day <= self.last_day:
+            raise ValueError(f"{day:%Y-%m-%d} is not after {self.last_day:%Y-%m-%d}")
+
+        rows = self._grow(list(loads.index))
+        x = np.zeros(len(self.keys))
+        x[rows] = loads.to_numpy(dtype="float64")
+        fresh = np.isnan(self.mean)
+        self.mean[fresh] = x[fresh]
+
+        # Scores against the state before today
+        with warnings.catch_warnings():
+            # New districts have an all-NaN window; their median stays NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nanmedian(self.buffer, axis=1)
+            mad = np.nanmedian(np.abs(self.buffer - median[:, None]), axis=1) * MAD_SCALE
+        robust_z = np.nan_to_num((x - median) / np.fmax(mad, MIN_SPREAD))
+        ewma_z = (x - self.mean) / np.fmax(np.sqrt(self.var), MIN_SPREAD)
+        self.cusum = np.maximum(0.0, self.cusum + ewma_z - CUSUM_SLACK)
+
+        detectors = np.stack([
+            robust_z > ROBUST_Z,
+            ewma_z > EWMA_Z,
+            self.cusum > CUSUM_LIMIT,
+        ])
+        flagged = (self.seen >= WARMUP) & detectors.any(axis=0)
+
+        alerts = self._alert_rows(day, flagged, x, robust_z, ewma_z, detectors)
+
+        # Fold today in
+        self.buffer[:, self.position] = x
+        self.position = (self.position + 1) % self.window
+        delta = x - self.mean
+        self.mean += self.smoothing * delta
+        self.var = (1 - self.smoothing) * (self.var + self.smoothing * delta ** 2)
+        self.cusum[detectors[2]] = 0.0
+        self.seen += 1
+
+        self.last_day = day
+        if not alerts.empty:
+            self._alerts.append(alerts)
+        return alerts
+
+    def _alert_rows(self, day, flagged, x, robust_z, ewma_z, detectors) -> pd.DataFrame:
+        idx = np.flatnonzero(flagged)
+        names = np.array(["robust z", "EWMA", "CUSUM"])
+        return pd.DataFrame({
+            "state": [self.keys[i][0] for i in idx],
+            "district": [self.keys[i][1] for i in idx],
+            "date": day,
+            "Updates": x[idx],
+            "Expected": self.mean[idx],
+            "Robust_Z": robust_z[idx],
+            "EWMA_Z": ewma_z[idx],
+            "CUSUM": self.cusum[idx],
+            "Detectors": [", ".join(names[detectors[:, i]]) for i in idx],
+        }, columns=ALERT_COLUMNS)
+
+    def alerts(self) -> pd.DataFrame:
+        """Every flagged district-day so far, oldest first."""
+        if not self._alerts:
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        self._alerts = [pd.concat(self._alerts, ignore_index=True)]
+        return self._alerts[0].copy()
+
+    # ===============================
+    # PERSISTENCE
+    # ===============================
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        alerts = self.alerts()
+        last_day = np.datetime64(self.last_day if self.last_day is not None else "NaT", "D")
+        values = ["Updates", "Expected", "Robust_Z", "EWMA_Z", "CUSUM"]
+
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            window=self.window,
+            smoothing=self.smoothing,
+            states=np.array([k[0] for k in self.keys], dtype=str),
+            districts=np.array([k[1] for k in self.keys], dtype=str),
+            buffer=self.buffer,
+            position=self.position,
+            mean=self.mean,
+            var=self.var,
+            cusum=self.cusum,
+            seen=self.seen,
+            last_day=last_day,
+            sources=self.sources,
+            history=self.history,
+            alert_keys=alerts[["state", "district", "Detectors"]].to_numpy(dtype=str),
+            alert_days=alerts["date"].to_numpy(dtype="datetime64[D]"),
+            alert_values=alerts[values].to_numpy(dtype="float64"),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> SurgeDetector:
+        with np.load(path, allow_pickle=False) as saved:
+            detector = cls(int(saved["window"]), float(saved["smoothing"]))
+            detector._grow(list(zip(saved["states"].tolist(), saved["districts"].tolist())))
+            detector.buffer = saved["buffer"]
+            detector.position = int(saved["position"])
+            detector.mean = saved["mean"]
+            detector.var = saved["var"]
+            detector.cusum = saved["cusum"]
+            detector.seen = saved["seen"]
+            last_day = saved["last_day"][()]
+            detector.last_day = None if np.isnat(last_day) else pd.Timestamp(last_day)
+            # States saved before fingerprints were kept never match, so
+            # refresh() rebuilds them
+            if "history" in saved.files:
+                detector.sources = str(saved["sources"])
+                detector.history = str(saved["history"])
+
+            keys, values = saved["alert_keys"], saved["alert_values"]
+            if len(keys):
+                alerts = pd.DataFrame(
+                    values, columns=["Updates", "Expected", "Robust_Z", "EWMA_Z", "CUSUM"]
+                )
+                alerts.insert(0, "state", keys[:, 0])
+                alerts.insert(1, "district", keys[:, 1])
+                alerts.insert(2, "date", pd.to_datetime(saved["alert_days"]))
+                alerts["Detectors"] = keys[:, 2]
+                detector._alerts = [alerts[ALERT_COLUMNS]]
+        return detector
+
+
+# ===============================
+# DAILY DROPS
+# ===============================
+def history_digest(daily: pd.DataFrame, through) -> str:
+    """SHA-256 of the loads in ``daily`` on every day up to ``through``.
+
+    ``daily`` is laid out as for :func:`refresh`. Districts with no load in
+    that range are left out, as the detector never sees them either.
+    """
+    days = daily.columns[daily.columns <= pd.Timestamp(through)]
+    values = daily[days].to_numpy(dtype="float64")
+    active = values.any(axis=1)
+
+    digest = hashlib.sha256()
+    digest.update(days.to_numpy(dtype="datetime64[D]").tobytes())
+    keys = daily.index[active].to_frame(index=False)
+    digest.update(pd.util.hash_pandas_object(keys, index=False).to_numpy().tobytes())
+    digest.update(np.ascontiguousarray(values[active]).tobytes())
+    return digest.hexdigest()
+
+
+def refresh(load_daily: Callable[[], pd.DataFrame], path: str | Path,
+            sources) -> SurgeDetector:
+    """Bring the detector saved at ``path`` up to date with ``load_daily()``.
+
+    ``load_daily`` returns one row per ``(state, district)`` and one column
+    per day, in date order. ``sources`` fingerprints the data it reads (any
+    JSON value, e.g. :func:`analytics.data.file_key` tuples): while it matches
+    the saved state's, nothing is loaded. Otherwise only days after the saved
+    state's last day are processed, unless the days already processed have
+    changed since (their :func:`history_digest` differs), in which case the
+    detector is rebuilt from scratch.
+    """
+    path = Path(path)
+    detector = SurgeDetector.load(path) if path.exists() else SurgeDetector()
+    sources = json.dumps(sources)
+    if detector.sources == sources:
+        return detector
+
+    daily = load_daily()
+    if detector.last_day is not None:
+        if history_digest(daily, detector.last_day) != detector.history:
+            detector = SurgeDetector()
+
+    pending = daily.columns
+    if detector.last_day is not None:
+        pending = pending[pending > detector.last_day]
+    for day in pending:
+        detector.update(day, daily[day])
+
+    detector.sources = sources
+    if detector.last_day is not None:
+        detector.history = history_digest(daily, detector.last_day)
+    detector.save(path)
+    return detector
@@ -0,0 +1,195 @@
+"""Page assets: minified stylesheets and inline images, encoded once per process.
+
+The pages embed their CSS in a ``<style>`` tag and the home page embeds its
+images as ``data:`` URIs, which Streamlit sends to the browser on every rerun.
+This module prepares both once and keeps the result in memory:
+
+- :func:`stylesheet` concatenates and minifies CSS files from ``styles/``
+- :func:`image_uri` resizes an image from ``assets/`` to the width it is shown
+  at and re-encodes it as WebP (``AADHAAR_IMAGE_FORMAT``: ``webp``, ``avif``
+  or ``png`` for the original file); without Pillow the original is used
+
+Entries are keyed on the source file's identity, so edited assets are picked
+up on the next rerun. ``python -m analytics.assets`` does the same work ahead
+of time into ``styles/build/`` and ``assets/build/``; fresh build outputs are
+read instead of re-encoding when a process starts.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import os
+import re
+import threading
+from pathlib import Path
+
+from analytics.data import file_key
+
+try:
+    from PIL import Image
+except ImportError:  # optional: images are served as-is
+    Image = None
+
+STYLES_DIR = Path("styles")
+ASSETS_DIR = Path("assets")
+BUILD = "build"
+
+IMAGE_FORMAT = os.environ.get("AADHAAR_IMAGE_FORMAT", "webp")
+IMAGE_QUALITY = 80
+
+FORMATS = {"webp": "image/webp", "avif": "image/avif", "png": "image/png"}
+
+# Widths the home page shows its images at, doubled for high-DPI screens
+IMAGE_WIDTHS = {
+    "story1.png": 800,
+    "story2.png": 800,
+    "story3.png": 800,
+    "mbulogo.png": 96,
+}
+
+_memory: dict[tuple, str] = {}
+_memory_lock = threading.Lock()
+
+
+def _remember(key: tuple, build):
+    with _memory_lock:
+        value = _memory.get(key)
+    if value is None:
+        value = build()
+        with _memory_lock:
+            for stale in [k for k in _memory if k[:2] == key[:2] and k != key]:
+                del _memory[stale]
+            _memory[key] = value
+    return value
+
+
+def _fresh(output: Path, source: Path) -> bool:
+    try:
+        return output.stat().st_mtime_ns >= source.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+# ===============================
+# CSS
+# ===============================
+_STRING = r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'"""
+_STRINGS = re.compile(f"({_STRING})")
+# A string, or a colon in a declaration: one whose statement ends in ";" or
+# "}" rather than opening a block, so selectors such as "div :first-child"
+# are left alone
+_DECLARATION_COLON = re.compile(
+    rf"""({_STRING})|:\s+(?=(?:{_STRING}|[^{{}};"'])*[;}}])"""
+)
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace; quoted strings are kept as-is."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    parts = _STRINGS.split(css)
+    for i in range(0, len(parts), 2):
+        text = re.sub(r"\s+", " ", parts[i])
+        text = re.sub(r"\s*([{};,])\s*", r"\1", text)
+        text = re.sub(r"\(\s+", "(", text)
+        text = re.sub(r"\s+\)", ")", text)
+        parts[i] = text.replace(";}", "}")
+    css = _DECLARATION_COLON.sub(lambda m: m.group(1) or ":", "".join(parts))
+    return css.strip()
+
+
+def _minified_path(name: str) -> Path:
+    return STYLES_DIR / BUILD / f"{Path(name).stem}.min.css"
+
+
+def _minified(name: str) -> str:
+    source = STYLES_DIR / name
+    built = _minified_path(name)
+    if _fresh(built, source):
+        return built.read_text(encoding="utf-8")
+    return minify_css(source.read_text(encoding="utf-8"))
+
+
+def stylesheet(*names: str) -> str:
+    """Minified contents of ``styles/<name>`` for each name, concatenated."""
+    key = ("css", names, tuple(file_key(STYLES_DIR / n) for n in names))
+    return _remember(key, lambda: "".join(_minified(n) for n in names))
+
+
+# ===============================
+# IMAGES
+# ===============================
+def _encode(source: Path, width: int | None, fmt: str) -> tuple[bytes, str]:
+    """Image bytes and MIME type of ``source`` at ``width`` in ``fmt``."""
+    if fmt == "png" or Image is None:
+        return source.read_bytes(), FORMATS.get(source.suffix.lstrip(".").lower(), "image/png")
+
+    with Image.open(source) as img:
+        if width and img.width > width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format=fmt.upper(), quality=IMAGE_QUALITY)
+    return out.getvalue(), FORMATS[fmt]
+
+
+def _thumbnail_path(name: str, width: int | None, fmt: str) -> Path:
+    return ASSETS_DIR / BUILD / f"{Path(name).stem}-{width or 'full'}.{fmt}"
+
+
+def image_uri(name: str, width: int | None = None, fmt: str | None = None) -> str:
+    """``data:`` URI of ``assets/<name>``, resized to ``width`` pixels at most.
+
+    ``width`` defaults to the entry in :data:`IMAGE_WIDTHS`.
+    """
+    fmt = fmt or IMAGE_FORMAT
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown image format {fmt!r}; expected {list(FORMATS)}")
+    width = width or IMAGE_WIDTHS.get(name)
+    source = ASSETS_DIR / name
+
+    def build() -> str:
+        built = _thumbnail_path(name, width, fmt)
+        if Image is not None and fmt != "png" and _fresh(built, source):
+            data, mime = built.read_bytes(), FORMATS[fmt]
+        else:
+            data, mime = _encode(source, width, fmt)
+        return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+    return _remember(("image", name, file_key(source), width, fmt), build)
+
+
+# ===============================
+# BUILD
+# ===============================
+def build(fmt: str | None = None, log=print) -> None:
+    """Write minified CSS and resized images to the ``build/`` folders."""
+    fmt = fmt or IMAGE_FORMAT
+
+    for source in sorted(STYLES_DIR.glob("*.css")):
+        out = _minified_path(source.name)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(minify_css(source.read_text(encoding="utf-8")), encoding="utf-8")
+        log(f"{source} {source.stat().st_size:>9,} -> {out.stat().st_size:>9,} bytes")
+
+    if Image is None or fmt == "png":
+        log("Images left as-is (needs Pillow and a webp/avif format)")
+        return
+    for name, width in IMAGE_WIDTHS.items():
+        source = ASSETS_DIR / name
+        data, _ = _encode(source, width, fmt)
+        out = _thumbnail_path(name, width, fmt)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(data)
+        log(f"{source} {source.stat().st_size:>9,} -> {out.stat().st_size:>9,} bytes")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Minify stylesheets and resize page images.")
+    parser.add_argument("--format", choices=list(FORMATS), default=IMAGE_FORMAT,
+                        help=f"image format (default {IMAGE_FORMAT})")
+    args = parser.parse_args(argv)
+    build(args.format)
+
+
+if __name__ == "__main__":
+    main()
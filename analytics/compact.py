@@ -0,0 +1,74 @@
+"""Compact in-memory layout of the pincode-day update tables.
+
+Parsed with pandas defaults, a raw row costs well over 100 bytes: ``state``
+and ``district`` as Python strings, ``pincode`` and counts as int64 and
+``date`` as a 64-bit timestamp. The loaders in :mod:`analytics.data` return
+the same rows as:
+
+- ``state`` / ``district``: categoricals (1–2 byte codes per row)
+- ``pincode``: uint32
+- age-band counts: uint16, or uint32 for a column whose maximum needs it
+- ``day``: uint16 days since 1970-01-01, replacing ``date``
+
+which is roughly 15 bytes per row. Consumers aggregate on ``day`` and turn
+the (much smaller) result back into dates with :func:`with_dates`.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from analytics.store import count_columns
+
+DAY_DTYPE = "uint16"
+
+UINT16_MAX = np.iinfo("uint16").max
+
+
+def to_day(dates: pd.Series) -> pd.Series:
+    """Day ordinals (days since 1970-01-01) of a datetime column without NaT."""
+    days = dates.to_numpy(dtype="datetime64[D]").astype("int64")
+    return pd.Series(days.astype(DAY_DTYPE), index=dates.index, name="day")
+
+
+def from_day(days: pd.Series) -> pd.Series:
+    """Inverse of :func:`to_day`."""
+    return pd.Series(
+        pd.to_datetime(days.to_numpy(dtype="int64"), unit="D"),
+        index=days.index,
+        name="date",
+    )
+
+
+def count_dtype(values: pd.Series) -> str:
+    """Smallest unsigned type that holds every count in ``values``."""
+    if values.empty or values.max() <= UINT16_MAX:
+        return "uint16"
+    return "uint32"
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` in the compact layout; columns not listed above are kept as is."""
+    counts = set(count_columns(df.columns))
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if col == "date":
+            out["day"] = to_day(values)
+        elif col in ("state", "district"):
+            out[col] = values.astype("category")
+        elif col == "pincode":
+            out[col] = values.astype("uint32")
+        elif col in counts:
+            out[col] = values.astype(count_dtype(values))
+        else:
+            out[col] = values
+    return pd.DataFrame(out, index=df.index)
+
+
+def with_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace the ``day`` ordinal with a ``date`` column in the same place."""
+    position = df.columns.get_loc("day")
+    out = df.drop(columns="day")
+    out.insert(position, "date", from_day(df["day"]))
+    return out
@@ -0,0 +1,258 @@
+"""Pre-aggregated rollup cube of update counts.
+
+The cube holds one row per ``state`` x ``district`` x ``date`` with one column
+per age band (``bio_age_*`` / ``demo_age_*``), i.e. the raw pincode-day rows
+summed over pincodes. It is written at merge time, one slice per source file
+under ``data/<kind>_cube/``, by the same workers that normalise the file, so a
+re-merge only rewrites the slices of the files that changed. Each merge ends
+by indexing the slices in the cube's own manifest (:func:`index_slices`).
+
+Pages ask :func:`totals` for per-date or per-district sums instead of
+aggregating raw rows on every render. When no cube has been materialised yet,
+it is built once from the raw table and cached.
+
+Loaded cubes are sorted by ``state``, ``district`` and ``date`` with sorted
+categories, so the codes themselves form a state/district index:
+:func:`select` finds a state's (or district's) rows with a binary search
+instead of scanning and filtering the national table.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from analytics.compact import with_dates
+from analytics.data import (
+    BIOMETRIC_COUNTS,
+    BIOMETRIC_CUBE,
+    BIOMETRIC_FILE,
+    BIOMETRIC_SHARED,
+    BIOMETRIC_STORE,
+    DEMOGRAPHIC_COUNTS,
+    DEMOGRAPHIC_CUBE,
+    DEMOGRAPHIC_FILE,
+    DEMOGRAPHIC_SHARED,
+    DEMOGRAPHIC_STORE,
+    cached,
+    load_biometric,
+    load_demographic,
+    pincode_day_source,
+)
+from analytics.manifest import MANIFEST_NAME, MANIFEST_VERSION, save_manifest
+from analytics.store import count_columns
+
+DIMENSIONS = ["state", "district", "date"]
+
+KINDS = {
+    "biometric": {
+        "cube": BIOMETRIC_CUBE,
+        "store": BIOMETRIC_STORE,
+        "file": BIOMETRIC_FILE,
+        "shared": BIOMETRIC_SHARED,
+        "load": load_biometric,
+        "counts": BIOMETRIC_COUNTS,
+        "measure": "Biometric_Updates",
+    },
+    "demographic": {
+        "cube": DEMOGRAPHIC_CUBE,
+        "store": DEMOGRAPHIC_STORE,
+        "file": DEMOGRAPHIC_FILE,
+        "shared": DEMOGRAPHIC_SHARED,
+        "load": load_demographic,
+        "counts": DEMOGRAPHIC_COUNTS,
+        "measure": "Demographic_Updates",
+    },
+}
+
+
+# ===============================
+# BUILDING (MERGE TIME)
+# ===============================
+def aggregate(rows: pd.DataFrame) -> pd.DataFrame:
+    """Sum pincode-level rows (or partial cube rows) up to cube granularity.
+
+    Compact rows (see :mod:`analytics.compact`) are grouped on their ``day``
+    ordinal and given dates afterwards.
+    """
+    counts = count_columns(rows.columns)
+    by = ["state", "district", "day" if "day" in rows.columns else "date"]
+    cube = (
+        rows.groupby(by, observed=True, sort=True)[counts]
+        .sum()
+        .reset_index()
+    )
+    cube[counts] = cube[counts].astype("uint32")
+    return with_dates(cube) if "day" in cube.columns else cube
+
+
+def write_slice(cube: pd.DataFrame, cube_dir: str | Path, token: str) -> None:
+    cube_dir = Path(cube_dir)
+    cube_dir.mkdir(parents=True, exist_ok=True)
+
+    schema = pa.schema(
+        [
+            ("state", pa.dictionary(pa.int32(), pa.string())),
+            ("district", pa.dictionary(pa.int32(), pa.string())),
+            ("date", pa.date32()),
+        ]
+        + [(c, pa.uint32()) for c in count_columns(cube.columns)]
+    )
+    table = pa.Table.from_pandas(cube, preserve_index=False).cast(schema)
+
+    ds.write_dataset(
+        table,
+        cube_dir,
+        format="parquet",
+        basename_template=f"{token}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def has_slice(cube_dir: str | Path, token: str) -> bool:
+    return any(Path(cube_dir).glob(f"{token}-*.parquet"))
+
+
+def prune_slices(cube_dir: str | Path, tokens) -> None:
+    """Delete slices whose source file is no longer merged."""
+    cube_dir = Path(cube_dir)
+    if not cube_dir.is_dir():
+        return
+    for path in cube_dir.glob("*.parquet"):
+        if path.stem.rsplit("-", 1)[0] not in tokens:
+            path.unlink()
+
+
+def index_slices(cube_dir: str | Path) -> None:
+    """Record the current slices in ``cube_dir``'s manifest.
+
+    Written after every merge, so the cube's fingerprint changes with its
+    slices without stat-ing each of them.
+    """
+    cube_dir = Path(cube_dir)
+    if not cube_dir.is_dir():
+        return
+    slices = {p.name: p.stat().st_size for p in sorted(cube_dir.glob("*.parquet"))}
+    save_manifest(cube_dir / MANIFEST_NAME, {"version": MANIFEST_VERSION, "slices": slices})
+
+
+# ===============================
+# LOADING
+# ===============================
+def indexed(frame: pd.DataFrame, by=DIMENSIONS) -> pd.DataFrame:
+    """Sort categories and rows so :func:`select` can binary-search codes.
+
+    ``by`` must start with ``state`` and ``district``.
+    """
+    for col in ("state", "district"):
+        values = frame[col].astype(str)
+        frame[col] = pd.Categorical(values, categories=sorted(values.unique()))
+    return frame.sort_values(list(by), ignore_index=True)
+
+
+@cached
+def read_cube(cube_dir: str | Path) -> pd.DataFrame:
+    table = ds.dataset(cube_dir, format="parquet").to_table()
+    return indexed(table.to_pandas(date_as_object=False))
+
+
+@cached
+def _cube_from_raw(source: str | Path, kind: str) -> pd.DataFrame:
+    # ``source`` only keys the cache; the loader picks store or CSV itself
+    spec = KINDS[kind]
+    rows = spec["load"](columns=["state", "district", "day"] + spec["counts"])
+    return indexed(aggregate(rows))
+
+
+def raw_source(kind: str) -> Path:
+    """Where ``kind``'s raw pincode-day rows come from: mapping, store or CSV."""
+    spec = KINDS[kind]
+    return pincode_day_source(spec["shared"], spec["store"], spec["file"])
+
+
+def source_path(kind: str) -> Path:
+    """Where the ``kind`` cube comes from: its slices or the raw rows."""
+    spec = KINDS[kind]
+    if any(spec["cube"].glob("*.parquet")):
+        return spec["cube"]
+    return raw_source(kind)
+
+
+def available() -> bool:
+    """Whether both kinds have pincode-day data (cube slices or raw rows)."""
+    return all(source_path(kind).exists() for kind in KINDS)
+
+
+def load_cube(kind: str) -> pd.DataFrame:
+    """The ``kind`` cube, falling back to aggregating the raw table once."""
+    source = source_path(kind)
+    if source == KINDS[kind]["cube"]:
+        return read_cube(source)
+    return _cube_from_raw(source, kind)
+
+
+# ===============================
+# STATE / DISTRICT INDEX
+# ===============================
+def _code_range(column: pd.Series, value: str) -> tuple[int, int]:
+    """Rows ``[lo, hi)`` holding ``value`` in a sorted categorical column."""
+    categories = column.cat.categories
+    if value not in categories:
+        return 0, 0
+    code = categories.get_loc(value)
+    lo, hi = np.searchsorted(column.cat.codes.to_numpy(), [code, code + 1])
+    return int(lo), int(hi)
+
+
+def select(cube: pd.DataFrame, state: str, district: str | None = None) -> pd.DataFrame:
+    """Rows of one state (and optionally one district) of an indexed frame."""
+    lo, hi = _code_range(cube["state"], state)
+    rows = cube.iloc[lo:hi]
+    if district is not None:
+        d_lo, d_hi = _code_range(rows["district"], district)
+        rows = rows.iloc[d_lo:d_hi]
+    return rows
+
+
+def states() -> list[str]:
+    """States present in either cube, for selectors."""
+    names = set()
+    for kind in KINDS:
+        names.update(load_cube(kind)["state"].cat.categories)
+    return sorted(names)
+
+
+def districts(state: str) -> list[str]:
+    """Districts of ``state`` present in either cube."""
+    names = set()
+    for kind in KINDS:
+        names.update(select(load_cube(kind), state)["district"].unique())
+    return sorted(names)
+
+
+# ===============================
+# QUERIES
+# ===============================
+def totals(kind: str, by, states=None, age_bands=None) -> pd.DataFrame:
+    """Updates summed over age bands and grouped ``by`` cube dimensions.
+
+    ``by`` may also contain ``"month"`` (first day of the month). Returns the
+    ``by`` columns plus ``Biometric_Updates`` or ``Demographic_Updates``.
+    """
+    spec = KINDS[kind]
+    by = list(by)
+    cube = load_cube(kind)
+
+    if states is not None:
+        cube = pd.concat([select(cube, s) for s in states]) if states else cube.iloc[0:0]
+    if "month" in by:
+        cube = cube.assign(month=cube["date"].dt.to_period("M").dt.to_timestamp())
+
+    bands = list(age_bands) if age_bands is not None else spec["counts"]
+    measure = spec["measure"]
+
+    cube = cube.assign(**{measure: cube[bands].sum(axis=1).astype("int64")})
+    return cube.groupby(by, as_index=False, observed=True)[measure].sum()
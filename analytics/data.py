@@ -0,0 +1,255 @@
+"""Cached loaders for the CSVs under ``data/``.
+
+Each loader parses its file once per process. Results are kept in a
+process-wide cache keyed on the file path plus its mtime and size, so every
+page and every session shares the same parsed frame, and replacing a file on
+disk (e.g. re-running a merge script) is picked up on the next call.
+
+The pincode-day tables are read from the memory-mapped file published by
+``merge_*_states.py --publish`` when it is up to date (see
+:mod:`analytics.shared`), else from the partitioned Parquet store written by
+``--format parquet`` when it exists, otherwise from the merged CSVs. Either
+way they come back in the compact layout of :mod:`analytics.compact`, and
+callers can ask for just the columns and states they need.
+
+Loaders return shallow copies: pages may add columns freely, but must not
+modify existing columns in place.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from analytics import timing
+from analytics.compact import compact
+from analytics.dates import parse_dates
+from analytics.manifest import MANIFEST_NAME
+from analytics.shared import map_shared
+from analytics.store import read_store
+
+# ===============================
+# FILE LOCATIONS
+# ===============================
+DATA_DIR = Path("data")
+
+GENERATION_FILE = DATA_DIR / "aa_generation_all_states_monthly.csv"
+UPDATES_FILE = DATA_DIR / "aa_updates_all_states_monthly.csv"
+ENROLMENT_FILE = DATA_DIR / "AllStates_MonthWise (2).csv"
+POPULATION_FILE = DATA_DIR / "state_population.csv"
+
+BIOMETRIC_FILE = DATA_DIR / "biometric_sampled_india.csv"
+DEMOGRAPHIC_FILE = DATA_DIR / "demographic_sampled_india.csv"
+
+BIOMETRIC_STORE = DATA_DIR / "biometric_store"
+DEMOGRAPHIC_STORE = DATA_DIR / "demographic_store"
+
+BIOMETRIC_CUBE = DATA_DIR / "biometric_cube"
+DEMOGRAPHIC_CUBE = DATA_DIR / "demographic_cube"
+
+BIOMETRIC_SHARED = DATA_DIR / "biometric_shared.arrow"
+DEMOGRAPHIC_SHARED = DATA_DIR / "demographic_shared.arrow"
+
+BIOMETRIC_COUNTS = ["bio_age_5_17", "bio_age_17_"]
+DEMOGRAPHIC_COUNTS = ["demo_age_5_17", "demo_age_17_"]
+
+BIOMETRIC_STATES_DIR = DATA_DIR / "biometric_states"
+DEMOGRAPHIC_STATES_DIR = DATA_DIR / "Demographic_states"
+
+# ===============================
+# PROCESS-WIDE CACHE
+# ===============================
+_cache: dict[tuple, pd.DataFrame] = {}
+_cache_lock = threading.Lock()
+_parse_locks: dict[tuple, threading.Lock] = {}
+
+
+def file_key(path: str | Path) -> tuple[str, int, int]:
+    """Identity of a file on disk: resolved path, mtime (ns) and size.
+
+    A directory written by a merge (the Parquet store, the cube slices) is
+    keyed on its ``MANIFEST_NAME``, which every merge rewrites last, so the
+    key changes with its contents without walking hundreds of fragments.
+    Other directories fall back to the newest mtime and total size of the
+    files beneath them.
+    """
+    path = Path(path)
+    if path.is_dir():
+        manifest = path / MANIFEST_NAME
+        if manifest.is_file():
+            stat = manifest.stat()
+            return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+        stats = [f.stat() for f in path.rglob("*") if f.is_file()]
+        mtime = max((st.st_mtime_ns for st in stats), default=0)
+        size = sum(st.st_size for st in stats)
+        return str(path.resolve()), mtime, size
+    stat = path.stat()
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def cached(parse):
+    """Cache ``parse(path, ...)`` on the file identity plus remaining arguments.
+
+    Concurrent callers asking for the same key wait for a single parse instead
+    of parsing in parallel. Entries for an older version of the same file are
+    dropped when the new version is stored.
+    """
+    signature = inspect.signature(parse)
+
+    @functools.wraps(parse)
+    def load(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        path, *rest = bound.arguments.values()
+
+        name, mtime, size = file_key(path)
+        key = (parse.__qualname__, name, mtime, size, tuple(rest))
+
+        with _cache_lock:
+            frame = _cache.get(key)
+            if frame is None:
+                parse_lock = _parse_locks.setdefault(key, threading.Lock())
+
+        if frame is None:
+            with parse_lock:
+                with _cache_lock:
+                    frame = _cache.get(key)
+                if frame is None:
+                    with timing.stage(f"parse {parse.__name__}"):
+                        frame = parse(*bound.args, **bound.kwargs)
+                    with _cache_lock:
+                        stale = [
+                            k for k in _cache
+                            if k[:2] == key[:2] and k[2:4] != key[2:4]
+                        ]
+                        for k in stale:
+                            del _cache[k]
+                        _cache[key] = frame
+                        _parse_locks.pop(key, None)
+
+        return frame.copy(deep=False)
+
+    return load
+
+
+def clear_cache() -> None:
+    """Forget every cached frame (mainly for tests and benchmarks)."""
+    with _cache_lock:
+        _cache.clear()
+        _parse_locks.clear()
+
+
+# ===============================
+# NATIONAL MONTHLY SERIES
+# ===============================
+@cached
+def load_generation(path: str | Path = GENERATION_FILE) -> pd.DataFrame:
+    """Monthly Aadhaar generation: ``req_month`` (datetime), ``cnt``, ``cumulative``."""
+    df = pd.read_csv(path)
+    df["req_month"] = parse_dates(df["req_month"])
+    return df
+
+
+@cached
+def load_updates(path: str | Path = UPDATES_FILE) -> pd.DataFrame:
+    """Monthly all-India updates: ``Month-Year`` (datetime), ``Value``, ``Cumulative Value``."""
+    df = pd.read_csv(path)
+    df["Month-Year"] = parse_dates(df["Month-Year"])
+    return df.dropna(subset=["Month-Year"]).reset_index(drop=True)
+
+
+@cached
+def load_enrolments(path: str | Path = ENROLMENT_FILE) -> pd.DataFrame:
+    """Monthly enrolments: ``Period`` (datetime), ``Month Values``, ``Cumulative Values``."""
+    df = pd.read_csv(path)
+    df["Period"] = parse_dates(df["Period"])
+    return df.dropna(subset=["Period"]).reset_index(drop=True)
+
+
+@cached
+def load_population(path: str | Path = POPULATION_FILE) -> pd.DataFrame:
+    """State / UT population: ``Rank``, ``State_Union_Territory``, ``Population_2024``."""
+    return pd.read_csv(path)
+
+
+# ===============================
+# PINCODE-DAY UPDATE TABLES
+# ===============================
+@cached
+def load_pincode_day_csv(path: str | Path) -> pd.DataFrame:
+    """One raw pincode-day CSV (merged or single state), compact layout."""
+    df = pd.read_csv(path, dtype={"state": "category", "district": "category"})
+    df["date"] = parse_dates(df["date"])
+    return compact(df.dropna(subset=["date"]).reset_index(drop=True))
+
+
+@cached
+def load_store(root: str | Path, columns=None, states=None) -> pd.DataFrame:
+    """Selected columns / state partitions of a Parquet store, compact layout."""
+    if columns is not None:
+        columns = ["date" if c == "day" else c for c in columns]
+    return compact(read_store(root, columns, states))
+
+
+@cached
+def load_shared(path: str | Path, columns=None, states=None) -> pd.DataFrame:
+    """Selected columns / states of a published, memory-mapped table."""
+    return map_shared(path, columns, states)
+
+
+def pincode_day_source(shared, store, csv_file) -> Path:
+    """The file the pincode-day loader reads: mapping, store or merged CSV.
+
+    The published mapping is only used while it is at least as new as the
+    store or CSV it was published from.
+    """
+    merged = Path(store) if Path(store).is_dir() else Path(csv_file)
+    if Path(shared).is_file():
+        if not merged.exists() or file_key(shared)[1] >= file_key(merged)[1]:
+            return Path(shared)
+    return merged
+
+
+def _load_pincode_day(shared, store, csv_file, columns, states) -> pd.DataFrame:
+    columns = tuple(columns) if columns is not None else None
+    states = tuple(sorted(states)) if states is not None else None
+
+    source = pincode_day_source(shared, store, csv_file)
+    if source == Path(shared):
+        return load_shared(source, columns, states)
+    if source == Path(store):
+        return load_store(source, columns, states)
+
+    df = load_pincode_day_csv(source)
+    if states is not None:
+        df = df[df["state"].isin(states)]
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def load_biometric(columns=None, states=None) -> pd.DataFrame:
+    """All-India biometric updates per pincode and day (``bio_age_*`` counts).
+
+    Rows come in the compact layout of :mod:`analytics.compact` (``day``
+    ordinal instead of ``date``). ``columns`` and ``states`` restrict what is
+    loaded; ``None`` means all.
+    """
+    return _load_pincode_day(
+        BIOMETRIC_SHARED, BIOMETRIC_STORE, BIOMETRIC_FILE, columns, states
+    )
+
+
+def load_demographic(columns=None, states=None) -> pd.DataFrame:
+    """All-India demographic updates per pincode and day (``demo_age_*`` counts).
+
+    Rows come in the compact layout of :mod:`analytics.compact` (``day``
+    ordinal instead of ``date``). ``columns`` and ``states`` restrict what is
+    loaded; ``None`` means all.
+    """
+    return _load_pincode_day(
+        DEMOGRAPHIC_SHARED, DEMOGRAPHIC_STORE, DEMOGRAPHIC_FILE, columns, states
+    )
@@ -0,0 +1,63 @@
+"""Date normalisation for the source files.
+
+Each source spells its dates in one fixed way: ``01-03-2025`` (raw update
+tables), ``2025-Jan`` (generation), ``Dec-2024`` (updates) or
+``       Oct-2024`` (enrolments, space padded). Rather than letting pandas
+infer a format per value, :func:`parse_dates` strips the strings, takes the
+distinct values (a few hundred at most, against millions of rows), detects
+which of :data:`KNOWN_FORMATS` they follow, parses those values once with
+that explicit format and maps the result back onto the rows.
+
+The loaders in :mod:`analytics.data` are cached, so each file is parsed once
+per version.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+# Tried in order; the first format every sampled value matches wins
+KNOWN_FORMATS = [
+    "%d-%m-%Y",
+    "%Y-%b",
+    "%b-%Y",
+    "%Y-%m-%d",
+    "%Y-%m",
+    "%b %Y",
+]
+
+SAMPLE_VALUES = 50
+
+
+def detect_format(values) -> str | None:
+    """First of :data:`KNOWN_FORMATS` matching a sample of ``values``."""
+    sample = pd.Series(values).dropna().head(SAMPLE_VALUES)
+    if sample.empty:
+        return None
+    for fmt in KNOWN_FORMATS:
+        try:
+            pd.to_datetime(sample, format=fmt)
+        except (ValueError, TypeError):
+            continue
+        return fmt
+    return None
+
+
+def parse_dates(values: pd.Series, fmt: str | None = None) -> pd.Series:
+    """Parse date strings; unparseable values become ``NaT``.
+
+    ``fmt`` skips detection when the format is known up front. Values matching
+    no known format fall back to pandas' day-first inference.
+    """
+    codes, uniques = pd.factorize(values.astype("string").str.strip())
+    uniques = pd.Series(uniques, dtype="object")
+
+    fmt = fmt or detect_format(uniques)
+    if fmt is not None:
+        parsed = pd.to_datetime(uniques, format=fmt, errors="coerce")
+    else:
+        parsed = pd.to_datetime(uniques, errors="coerce", dayfirst=True)
+
+    # Missing values have code -1; route them to a trailing NaT
+    lookup = pd.concat([parsed, pd.Series([pd.NaT], dtype=parsed.dtype)], ignore_index=True)
+    dates = lookup.to_numpy()[codes]
+    return pd.Series(dates, index=values.index, name=values.name)
@@ -0,0 +1,162 @@
+"""Persistent, size-bounded cache for derived DataFrames.
+
+Functions decorated with :func:`disk_cached` store their result as an Arrow
+IPC (Feather) file under ``AADHAAR_CACHE_DIR`` (default ``.cache/derived``).
+The cache key combines the function's qualified name and source code, its
+arguments, and the fingerprint (path, mtime, size) of every input it declares,
+so a result is recomputed as soon as an input file or the code changes.
+
+Several Streamlit replicas can share the directory: writes are atomic, a new
+replica warm-starts from whatever is already there, and the oldest entries
+(by last use) are evicted once the directory exceeds ``AADHAAR_CACHE_MB``.
+Results are also kept in memory so reruns within a process skip the disk.
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from analytics import timing
+from analytics.data import file_key
+
+CACHE_DIR = Path(os.environ.get("AADHAAR_CACHE_DIR", ".cache/derived"))
+CACHE_MB = float(os.environ.get("AADHAAR_CACHE_MB", "256"))
+
+MEMORY_ENTRIES = 64
+
+_memory: OrderedDict[str, pd.DataFrame] = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+# ===============================
+# KEYS
+# ===============================
+def _fingerprint(sources) -> list:
+    prints = []
+    for source in sources:
+        path = source() if callable(source) else source
+        try:
+            prints.append(file_key(path))
+        except FileNotFoundError:
+            prints.append((str(path), None, None))
+    return prints
+
+
+def cache_key(func, code: str, sources, args, kwargs) -> str:
+    payload = repr((
+        func.__module__,
+        func.__qualname__,
+        code,
+        args,
+        sorted(kwargs.items()),
+        _fingerprint(sources),
+    ))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ===============================
+# STORAGE
+# ===============================
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.arrow"
+
+
+def _read(key: str) -> pd.DataFrame | None:
+    path = _entry_path(key)
+    try:
+        table = feather.read_table(path)
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    # Mark as recently used for LRU eviction
+    with contextlib.suppress(FileNotFoundError):
+        os.utime(path)
+    return table.to_pandas()
+
+
+def _write(key: str, df: pd.DataFrame) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(key)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    feather.write_feather(pa.Table.from_pandas(df), tmp, compression="lz4")
+    os.replace(tmp, path)
+    evict()
+
+
+def evict(limit_mb: float | None = None) -> None:
+    """Drop least recently used entries until the cache fits ``limit_mb``."""
+    limit = (CACHE_MB if limit_mb is None else limit_mb) * 2**20
+    entries = []
+    for path in CACHE_DIR.glob("*.arrow"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def clear() -> None:
+    """Drop every entry, in memory and on disk (mainly for benchmarks)."""
+    with _memory_lock:
+        _memory.clear()
+    evict(limit_mb=0)
+
+
+def _remember(key: str, df: pd.DataFrame) -> None:
+    with _memory_lock:
+        _memory[key] = df
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+# ===============================
+# DECORATOR
+# ===============================
+def disk_cached(*sources):
+    """Memoise a DataFrame-returning function on disk.
+
+    ``sources`` are the input files or directories the result depends on,
+    either as paths or as zero-argument callables returning a path (for
+    inputs whose location is only known at call time). Arguments must have a
+    stable ``repr``.
+    """
+    def decorate(func):
+        code = inspect.getsource(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(func, code, sources, args, kwargs)
+
+            with _memory_lock:
+                df = _memory.get(key)
+            if df is None:
+                with timing.stage(f"disk read {func.__name__}"):
+                    df = _read(key)
+                if df is None:
+                    with timing.stage(f"compute {func.__name__}"):
+                        df = func(*args, **kwargs)
+                    _write(key, df)
+                _remember(key, df)
+
+            return df.copy(deep=False)
+
+        return wrapper
+
+    return decorate
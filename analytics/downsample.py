@@ -0,0 +1,114 @@
+"""Thin long time series before they are handed to Plotly.
+
+A line chart cannot show more points than it has horizontal pixels, but
+Plotly still serialises, ships and draws every one of them. :func:`downsample`
+keeps at most about one point per pixel of chart width, chosen so the shape
+survives:
+
+- ``lttb`` (Largest-Triangle-Three-Buckets): per bucket, the point forming the
+  largest triangle with the previous pick and the next bucket's mean, which
+  keeps peaks, dips and surges
+- ``minmax``: the minimum and maximum of every bucket, which keeps every
+  extreme exactly (at two points per bucket)
+
+With several value columns the points picked for each are combined, so every
+series keeps its own peaks. ``AADHAAR_DOWNSAMPLE`` picks the method
+(``none`` turns downsampling off).
+"""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+METHODS = ["lttb", "minmax", "none"]
+
+METHOD = os.environ.get("AADHAAR_DOWNSAMPLE", "lttb")
+
+# Widest chart the pages draw: the block container's max-width in base.css
+CHART_WIDTH = 1400
+POINTS_PER_PIXEL = 1.0
+
+
+def _numeric(values) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[ns]").astype("int64")
+    return values.astype("float64")
+
+
+def lttb(x, y, n: int) -> np.ndarray:
+    """Indices of ``n`` points picked by Largest-Triangle-Three-Buckets."""
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x, y = _numeric(x), _numeric(y)
+
+    # n - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, size - 1, n - 1).astype("int64")
+    picks = np.empty(n, dtype="int64")
+    picks[0], picks[-1] = 0, size - 1
+
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i < n - 3:
+            nxt = slice(edges[i + 1], edges[i + 2])
+            avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        picks[i + 1] = a
+    return picks
+
+
+def minmax(x, y, n: int) -> np.ndarray:
+    """Indices of the minimum and maximum of ``n // 2`` equal-count buckets."""
+    size = len(y)
+    buckets = n // 2
+    if n >= size or buckets < 1:
+        return np.arange(size)
+    y = _numeric(y)
+
+    bucket = np.arange(size) * buckets // size
+    order = np.lexsort((y, bucket))
+    starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    ends = np.r_[starts[1:], size] - 1
+    return np.unique(np.concatenate([order[starts], order[ends], [0, size - 1]]))
+
+
+_PICKERS = {"lttb": lttb, "minmax": minmax}
+
+
+def points_for(width: int = CHART_WIDTH) -> int:
+    """Points worth drawing on a chart ``width`` pixels wide."""
+    return max(3, int(width * POINTS_PER_PIXEL))
+
+
+def downsample(df: pd.DataFrame, x: str, columns, width: int = CHART_WIDTH,
+               x_range=None, method: str | None = None) -> pd.DataFrame:
+    """Rows of ``df`` (sorted by ``x``) worth drawing at ``width`` pixels.
+
+    ``x_range`` restricts the rows to a zoomed ``(start, end)`` window first,
+    so zooming in brings back the detail dropped at full range.
+    """
+    method = method or METHOD
+    if method not in METHODS:
+        raise ValueError(f"unknown downsampling method {method!r}; expected {METHODS}")
+
+    if x_range is not None:
+        start, end = x_range
+        df = df[(df[x] >= start) & (df[x] <= end)]
+    df = df.reset_index(drop=True)
+
+    n = points_for(width)
+    if method == "none" or len(df) <= n:
+        return df
+
+    pick = _PICKERS[method]
+    keep = np.unique(np.concatenate([pick(df[x], df[c], n) for c in columns]))
+    return df.iloc[keep].reset_index(drop=True)
@@ -0,0 +1,285 @@
+"""Plotly figures for the pages, built from the tables in :mod:`analytics.pipelines`.
+
+Every chart the pages draw with Plotly is defined here as a function of its
+input table, so the live pages and the offline report (:mod:`analytics.report`)
+produce exactly the same figure. Long time series are thinned by
+:func:`analytics.downsample.downsample` before they reach Plotly.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from analytics.downsample import CHART_WIDTH, downsample
+
+MARGIN = dict(l=20, r=20, t=20, b=20)
+
+
+# ===============================
+# PAGE 02 — TEMPORAL BEHAVIOUR
+# ===============================
+def update_trend(updates: pd.DataFrame) -> go.Figure:
+    fig = px.area(
+        updates,
+        x="Month-Year",
+        y="Value",
+        labels={
+            "Month-Year": "Month",
+            "Value": "Number of Updates"
+        }
+    )
+    fig.update_layout(height=420, showlegend=False, margin=MARGIN)
+    return fig
+
+
+def update_change(updates: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        updates,
+        x="Month-Year",
+        y="MoM Change",
+        labels={
+            "Month-Year": "Month",
+            "MoM Change": "Change from Previous Month"
+        }
+    )
+    fig.update_layout(height=380, showlegend=False, margin=MARGIN)
+    return fig
+
+
+def state_monthly(df: pd.DataFrame, states) -> go.Figure:
+    fig = px.line(
+        df[df["state"].isin(states)],
+        x="Month",
+        y="Updates",
+        color="state",
+        markers=True,
+        hover_data={"MoM_Pct": ":+.1f", "YoY_Pct": ":+.1f"},
+        labels={"Updates": "Updates (scaled to full month)", "state": "State"}
+    )
+    fig.update_layout(height=420, legend_title_text="", margin=MARGIN)
+    return fig
+
+
+def seasonality_heatmap(df: pd.DataFrame, profile: str) -> go.Figure:
+    rows = df[df["Profile"] == profile].sort_values("Order")
+    matrix = rows.pivot_table(
+        index="state", columns="Period", values="Index", sort=False, dropna=False
+    )
+    fig = px.imshow(
+        matrix,
+        aspect="auto",
+        color_continuous_scale="RdBu_r",
+        color_continuous_midpoint=100,
+        labels={"x": profile, "y": "State", "color": "Index"}
+    )
+    fig.update_layout(height=max(300, 22 * len(matrix) + 120), margin=MARGIN)
+    return fig
+
+
+def state_volatility(df: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        df,
+        x="Daily_CV",
+        y="state",
+        orientation="h",
+        color="MoM_Volatility",
+        color_continuous_scale="Oranges",
+        labels={
+            "Daily_CV": "Daily Load Variation (CV)",
+            "state": "State",
+            "MoM_Volatility": "MoM Spread (pp)"
+        }
+    )
+    fig.update_layout(
+        height=max(300, 22 * len(df) + 120),
+        yaxis={"categoryorder": "total ascending"},
+        margin=MARGIN
+    )
+    return fig
+
+
+# ===============================
+# PAGE 03 — UPDATE DOMINANCE
+# ===============================
+def enrolments_vs_updates(df: pd.DataFrame) -> go.Figure:
+    fig = px.line(
+        df,
+        x="Month",
+        y=["Enrolments", "Updates"],
+        labels={"value": "Count", "variable": "Activity Type"}
+    )
+    fig.update_layout(legend_title_text="", height=420)
+    return fig
+
+
+def dominance_ratio(df: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        df,
+        x="Month",
+        y="Update_to_Enrolment_Ratio",
+        labels={"Update_to_Enrolment_Ratio": "Updates per Enrolment"}
+    )
+    fig.update_layout(height=380)
+    return fig
+
+
+# ===============================
+# PAGE 04 — LIVING IDENTITY
+# ===============================
+def update_types(df: pd.DataFrame, x_range=None, width: int = CHART_WIDTH) -> go.Figure:
+    series = ["Biometric_Updates", "Demographic_Updates"]
+    df = downsample(df, "date", series, width=width, x_range=x_range)
+
+    fig = px.line(
+        df,
+        x="date",
+        y=series,
+        labels={
+            "value": "Number of Updates",
+            "variable": "Update Type",
+            "date": "Month"
+        }
+    )
+    fig.update_layout(legend_title_text="", height=420)
+    return fig
+
+
+# ===============================
+# PAGE 05 — DISTRICT PRESSURE
+# ===============================
+def top_districts(top_df: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        top_df,
+        x="Total_Updates",
+        y="district",
+        orientation="h",
+        color="Total_Updates",
+        color_continuous_scale="Blues"
+    )
+    fig.update_layout(
+        height=500,
+        yaxis_title="District",
+        xaxis_title="Total Updates",
+        coloraxis_showscale=False
+    )
+    return fig
+
+
+def district_mix(stack_df: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        stack_df,
+        x="Count",
+        y="district",
+        color="Update Type",
+        orientation="h"
+    )
+    fig.update_layout(
+        height=500,
+        xaxis_title="Number of Updates",
+        yaxis_title="District",
+        legend_title_text=""
+    )
+    return fig
+
+
+def top_pincodes(pin_df: pd.DataFrame) -> go.Figure:
+    pin_df = pin_df.assign(pincode=pin_df["pincode"].astype(str))
+    fig = px.bar(
+        pin_df,
+        x="pincode",
+        y=["Biometric_Updates", "Demographic_Updates"],
+    )
+    fig.update_layout(
+        height=450,
+        xaxis_title="Pincode",
+        yaxis_title="Number of Updates",
+        xaxis_type="category",
+        legend_title_text=""
+    )
+    return fig
+
+
+# ===============================
+# PAGE 06 — PRESSURE DEEP DIVE
+# ===============================
+def concentration_curve(df: pd.DataFrame) -> go.Figure:
+    fig = px.line(
+        df,
+        x="District_Rank",
+        y="Cumulative_Share",
+        labels={
+            "District_Rank": "District Rank (High → Low Pressure)",
+            "Cumulative_Share": "Cumulative % of Total Updates"
+        }
+    )
+    fig.update_layout(height=420, showlegend=False)
+    return fig
+
+
+def gini_ranking(gini_df: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        gini_df,
+        x="Gini",
+        y="state",
+        orientation="h",
+        color="Selected",
+        color_discrete_map={True: "#1f77b4", False: "#c7d4e8"},
+        hover_data={"Top_20_Share": ":.1f", "HHI": ":.3f", "Members": True, "Selected": False}
+    )
+    fig.update_layout(
+        height=max(300, 22 * len(gini_df)),
+        xaxis_title="Gini Coefficient",
+        yaxis_title="State",
+        yaxis={"categoryorder": "total ascending"},
+        showlegend=False
+    )
+    return fig
+
+
+def per_capita_ranking(df: pd.DataFrame) -> go.Figure:
+    fig = px.bar(
+        df,
+        x="Per_1000",
+        y="state",
+        orientation="h",
+        color="Selected",
+        color_discrete_map={True: "#1f77b4", False: "#c7d4e8"},
+        hover_data={
+            "Total_Updates": ":,",
+            "Population": ":,",
+            "Index": ":.0f",
+            "Selected": False
+        },
+        labels={"Per_1000": "Updates per 1,000 Residents", "state": "State"}
+    )
+    fig.update_layout(
+        height=max(300, 22 * len(df)),
+        yaxis={"categoryorder": "total ascending"},
+        showlegend=False
+    )
+    return fig
+
+
+# ===============================
+# PAGE 07 — PREDICTIVE INSIGHT
+# ===============================
+def national_forecast(nat_df: pd.DataFrame) -> go.Figure:
+    actual = nat_df[nat_df["Series"] == "Actual"]
+    nxt = nat_df[nat_df["Series"] == "Forecast"].iloc[0]
+
+    fig = px.line(actual, x="Month", y="Updates", markers=True)
+    fig.add_scatter(
+        x=[nxt["Month"]],
+        y=[nxt["Updates"]],
+        mode="markers",
+        name="Forecast",
+        error_y={
+            "type": "data",
+            "symmetric": False,
+            "array": [nxt["Upper"] - nxt["Updates"]],
+            "arrayminus": [nxt["Updates"] - nxt["Lower"]],
+        },
+    )
+    fig.update_layout(height=380, xaxis_title="Month", yaxis_title="All-India Updates", showlegend=False)
+    return fig
@@ -0,0 +1,157 @@
+"""Batch one-step-ahead forecasts for many series at once.
+
+Series are rows of a ``series x periods`` matrix (e.g. every district's
+monthly update load). Each model fits all rows together with NumPy array
+operations, looping at most over time periods, never over series:
+
+- ``seasonal_naive``: the value one season ago (plain naive when the history
+  is shorter than a season)
+- ``exp_smoothing``: simple exponential smoothing; the smoothing factor is
+  picked per series from a grid by one-step-ahead squared error
+- ``rolling_regression``: a linear trend fitted to the last ``window``
+  periods and extended one period
+
+Every model returns a point forecast and the standard deviation of its
+one-step error, from which :func:`predict` builds a prediction interval.
+"""
+from __future__ import annotations
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+MODELS = ["seasonal_naive", "exp_smoothing", "rolling_regression"]
+
+SEASON = 12
+ALPHAS = np.linspace(0.1, 0.9, 9)
+WINDOW = 6
+
+# Months reported on fewer than this share of their days are left out
+MIN_COVERAGE = 0.5
+
+
+# ===============================
+# MODELS
+# ===============================
+def _rms(errors: np.ndarray) -> np.ndarray:
+    if errors.shape[1] == 0:
+        return np.zeros(errors.shape[0])
+    return np.sqrt(np.mean(errors ** 2, axis=1))
+
+
+def seasonal_naive(y: np.ndarray, season: int = SEASON):
+    lag = season if y.shape[1] > season else 1
+    return y[:, -lag], _rms(y[:, lag:] - y[:, :-lag])
+
+
+def exp_smoothing(y: np.ndarray, alphas=ALPHAS):
+    alphas = np.atleast_1d(np.asarray(alphas, dtype="float64"))[:, None]
+
+    # One level per (alpha, series); errors are one-step-ahead
+    level = np.repeat(y[None, :, 0], len(alphas), axis=0)
+    sse = np.zeros_like(level)
+    for t in range(1, y.shape[1]):
+        error = y[:, t] - level
+        sse += error ** 2
+        level += alphas * error
+
+    best = sse.argmin(axis=0)
+    series = np.arange(y.shape[0])
+    steps = max(y.shape[1] - 1, 1)
+    return level[best, series], np.sqrt(sse[best, series] / steps)
+
+
+def rolling_regression(y: np.ndarray, window: int = WINDOW):
+    window = min(window, y.shape[1])
+    if window < 3:
+        return seasonal_naive(y, season=1)
+
+    recent = y[:, -window:]
+    t = np.arange(window, dtype="float64")
+    t_mean = t.mean()
+    sxx = ((t - t_mean) ** 2).sum()
+
+    y_mean = recent.mean(axis=1)
+    slope = ((recent - y_mean[:, None]) * (t - t_mean)).sum(axis=1) / sxx
+    intercept = y_mean - slope * t_mean
+
+    fitted = intercept[:, None] + slope[:, None] * t
+    sigma = np.sqrt(((recent - fitted) ** 2).sum(axis=1) / (window - 2))
+    # Prediction error at t = window includes the uncertainty of the fit
+    sigma *= np.sqrt(1 + 1 / window + (window - t_mean) ** 2 / sxx)
+    return intercept + slope * window, sigma
+
+
+_FITTERS = {
+    "seasonal_naive": seasonal_naive,
+    "exp_smoothing": exp_smoothing,
+    "rolling_regression": rolling_regression,
+}
+
+
+def predict(y: np.ndarray, model: str = "exp_smoothing", level: float = 0.95, **params):
+    """Next-period ``(forecast, lower, upper)`` for every row of ``y``.
+
+    Bounds are a normal ``level`` interval around the forecast, clipped at
+    zero since update counts cannot be negative.
+    """
+    if model not in _FITTERS:
+        raise ValueError(f"unknown model {model!r}; expected {MODELS}")
+    y = np.asarray(y, dtype="float64")
+    if y.shape[1] == 0:
+        empty = np.full(y.shape[0], np.nan)
+        return empty, empty, empty
+
+    point, sigma = _FITTERS[model](y, **params)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    point = np.maximum(point, 0)
+    return point, np.maximum(point - z * sigma, 0), point + z * sigma
+
+
+# ===============================
+# FRAMES
+# ===============================
+def monthly_matrix(daily: pd.DataFrame, keys, value: str,
+                   min_coverage: float = MIN_COVERAGE) -> pd.DataFrame:
+    """Daily rows -> one row per ``keys`` and one column per covered month.
+
+    A month is kept when at least ``min_coverage`` of its days appear anywhere
+    in ``daily`` (so a partially reported month can be kept), and its total is
+    scaled up to the full month by that share. Months below the threshold are
+    dropped. Missing key/month cells are 0.
+    """
+    keys = list(keys)
+    month = daily["date"].dt.to_period("M")
+
+    reported = daily["date"].groupby(month).nunique()
+    coverage = reported / reported.index.days_in_month
+    kept = coverage[coverage >= min_coverage].index
+
+    matrix = (
+        daily.assign(month=month)
+        .pivot_table(index=keys, columns="month", values=value,
+                     aggfunc="sum", fill_value=0, observed=True)
+        .reindex(columns=kept, fill_value=0)
+    )
+    return matrix / coverage[kept].to_numpy()
+
+
+def forecast_table(matrix: pd.DataFrame, model: str = "exp_smoothing",
+                   level: float = 0.95, **params) -> pd.DataFrame:
+    """Next-period forecast for every row of a ``series x periods`` frame.
+
+    Columns: the index levels, ``Last``, ``Forecast``, ``Lower``, ``Upper``
+    and ``Change_Pct`` (forecast vs last period).
+    """
+    point, lower, upper = predict(matrix.to_numpy(), model, level, **params)
+    last = matrix.iloc[:, -1].to_numpy() if matrix.shape[1] else np.full(len(matrix), np.nan)
+
+    table = pd.DataFrame(
+        {"Last": last, "Forecast": point, "Lower": lower, "Upper": upper},
+        index=matrix.index,
+    )
+    table["Change_Pct"] = np.divide(
+        point - last, last, out=np.full(len(table), np.nan), where=last > 0
+    ) * 100
+    return table.reset_index()
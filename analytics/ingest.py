@@ -0,0 +1,87 @@
+"""Chunked, schema-checked reading of the per-state update CSVs.
+
+State files are read in chunks with explicit dtypes instead of whole-file
+``pd.read_csv`` calls, so the merge's working set is bounded by the chunk size
+rather than by the size of the input. The chunk size is derived from a memory
+cap: a small sample of each file gives its in-memory bytes per row, and each
+chunk is sized so that the parsed rows plus their converted copies stay under
+the cap.
+
+The cap governs the data held by the merge; the interpreter and libraries
+(pandas, pyarrow) add a fixed baseline on top of it.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from analytics.data import BIOMETRIC_COUNTS, DEMOGRAPHIC_COUNTS
+
+# ===============================
+# EXPECTED SCHEMAS
+# ===============================
+KEY_COLUMNS = ["date", "state", "district", "pincode"]
+
+SCHEMAS = {
+    "biometric": KEY_COLUMNS + BIOMETRIC_COUNTS,
+    "demographic": KEY_COLUMNS + DEMOGRAPHIC_COUNTS,
+}
+
+DEFAULT_MEMORY_MB = 512
+
+# Parsed chunk, its columnar conversion and the Arrow table built from it
+# are alive at the same time during a write
+WORKING_COPIES = 4
+
+SAMPLE_ROWS = 2000
+MIN_CHUNK_ROWS = 10_000
+
+
+class SchemaError(ValueError):
+    """A state file does not match the expected columns or types."""
+
+
+def dtypes(columns: list[str]) -> dict:
+    types = {"date": str, "state": str, "district": str, "pincode": "uint32"}
+    types.update({c: "uint32" for c in columns if c not in types})
+    return types
+
+
+def validate_header(path: str | Path, kind: str) -> list[str]:
+    expected = SCHEMAS[kind]
+    header = list(pd.read_csv(path, nrows=0).columns)
+    if header != expected:
+        missing = [c for c in expected if c not in header]
+        extra = [c for c in header if c not in expected]
+        raise SchemaError(
+            f"{path}: expected columns {expected}, got {header} "
+            f"(missing {missing}, unexpected {extra})"
+        )
+    return header
+
+
+def chunk_rows(path: str | Path, kind: str, memory_mb: float) -> int:
+    """Rows per chunk so that a chunk's working set fits in ``memory_mb``."""
+    columns = SCHEMAS[kind]
+    sample = pd.read_csv(path, nrows=SAMPLE_ROWS, dtype=dtypes(columns))
+    if sample.empty:
+        return MIN_CHUNK_ROWS
+
+    row_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    rows = int(memory_mb * 2**20 / (row_bytes * WORKING_COPIES))
+    return max(rows, MIN_CHUNK_ROWS)
+
+
+def iter_chunks(path: str | Path, kind: str, memory_mb: float = DEFAULT_MEMORY_MB):
+    """Yield validated chunks of one state file with explicit dtypes.
+
+    Blank or non-numeric pincodes and counts raise :class:`SchemaError`.
+    """
+    columns = validate_header(path, kind)
+    try:
+        chunksize = chunk_rows(path, kind, memory_mb)
+        with pd.read_csv(path, dtype=dtypes(columns), chunksize=chunksize) as reader:
+            yield from reader
+    except ValueError as exc:
+        raise SchemaError(f"{path}: {exc}") from exc
@@ -0,0 +1,108 @@
+"""Source-file manifests for incremental merges.
+
+A manifest records, for every state file that went into a merged output, its
+size, mtime, SHA-256 and row count (plus, for the Parquet store, the
+fragments it was written to). Comparing the manifest against the input folder
+tells a merge which files are new, changed or gone, so only those are
+re-processed.
+
+Directory outputs (the Parquet store, the cube slices) keep theirs as
+``MANIFEST_NAME`` inside the directory, rewritten last on every merge, so its
+stat also serves as the directory's fingerprint (see
+:func:`analytics.data.file_key`).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+MANIFEST_VERSION = 1
+
+MANIFEST_NAME = "_manifest.json"
+
+
+class Changes(NamedTuple):
+    added: list[Path]
+    changed: list[Path]
+    removed: list[str]
+    unchanged: list[Path]
+
+    @property
+    def stale(self) -> list[str]:
+        """Manifest entries whose output must be dropped before re-writing."""
+        return [p.name for p in self.changed] + self.removed
+
+    @property
+    def pending(self) -> list[Path]:
+        """Files that have to be (re-)processed."""
+        return self.added + self.changed
+
+
+def file_digest(path: str | Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def load_manifest(path: str | Path) -> dict:
+    """The manifest at ``path``; empty when missing or from another version."""
+    try:
+        manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"version": MANIFEST_VERSION, "files": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "files": {}}
+    return manifest
+
+
+def save_manifest(path: str | Path, manifest: dict) -> None:
+    """Write atomically so an interrupted merge never leaves a torn manifest."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def diff_sources(files, manifest: dict) -> Changes:
+    """Classify ``files`` against ``manifest``.
+
+    Files whose size and mtime match their entry are trusted unchanged without
+    hashing. Otherwise the content hash decides, so a mere ``touch`` does not
+    trigger a re-merge; the refreshed mtime is written back into the entry.
+    """
+    entries = manifest["files"]
+    added, changed, unchanged = [], [], []
+
+    for path in map(Path, files):
+        entry = entries.get(path.name)
+        stat = path.stat()
+
+        if entry is None:
+            added.append(path)
+        elif entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            unchanged.append(path)
+        elif entry["sha256"] == file_digest(path):
+            entry["mtime_ns"] = stat.st_mtime_ns
+            unchanged.append(path)
+        else:
+            changed.append(path)
+
+    names = {Path(f).name for f in files}
+    removed = sorted(name for name in entries if name not in names)
+    return Changes(added, changed, removed, unchanged)
+
+
+def source_entry(path: str | Path, rows: int, **extra) -> dict:
+    stat = Path(path).stat()
+    return {
+        "sha256": file_digest(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "rows": int(rows),
+        **extra,
+    }
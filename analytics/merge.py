@@ -0,0 +1,351 @@
+"""Merge per-state update drops into all-India outputs.
+
+Shared by ``merge_biometric_states.py`` and ``merge_demographic_states.py``.
+Two output formats are supported:
+
+- ``csv``: the original single merged CSV read by the pages
+- ``parquet``: a ``state``/``month`` partitioned columnar store (see
+  :mod:`analytics.store`) that pages load selectively
+
+Both outputs keep a manifest of the state files they were built from (see
+:mod:`analytics.manifest`), so a re-run only processes new or changed files:
+
+- parquet: each state file owns its own fragments inside the partitions it
+  touches; a changed or removed file has just those fragments replaced
+- csv: new files are appended; a changed or removed file forces a rewrite,
+  since rows cannot be removed from the middle of a CSV in place
+
+``--full`` ignores the manifest and rebuilds from scratch.
+
+State files are streamed in chunks (see :mod:`analytics.ingest`) and written
+out chunk by chunk, so memory stays bounded by ``--max-memory`` however many
+states are merged.
+
+With ``--workers N`` state files are processed by a pool of N processes. Each
+worker reads, validates and normalises one file, writes it out (its own
+Parquet fragments, or a CSV part that the parent stitches together) and
+returns the file's manifest entry, including its rows per ``state/month``
+partition. Results are combined in sorted file order, so the output does not
+depend on the number of workers. The memory cap is shared between workers.
+
+Alongside either format, each worker also pre-aggregates its file into a
+slice of the rollup cube (see :mod:`analytics.cube`), which the pages query
+instead of raw rows.
+
+``--publish`` finally writes the merged table as a memory-mapped file that
+all Streamlit processes share (see :mod:`analytics.shared`). Unlike the merge
+itself this holds the whole table in memory, in its compact layout.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import itertools
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from analytics.cube import (
+    KINDS,
+    aggregate,
+    has_slice,
+    index_slices,
+    prune_slices,
+    write_slice,
+)
+from analytics.data import load_pincode_day_csv, load_store
+from analytics.ingest import DEFAULT_MEMORY_MB, SCHEMAS, SchemaError, iter_chunks
+from analytics.manifest import (
+    MANIFEST_NAME,
+    MANIFEST_VERSION,
+    diff_sources,
+    load_manifest,
+    save_manifest,
+    source_entry,
+)
+from analytics.shared import publish
+from analytics.store import delete_fragments, to_columnar, write_store
+
+FORMATS = ["csv", "parquet", "both"]
+
+
+def source_files(input_folder: str | Path) -> list[Path]:
+    return sorted(Path(f) for f in glob.glob(f"{input_folder}/*.csv"))
+
+
+def source_token(path: str | Path) -> str:
+    """Fragment name prefix for a state file (safe for file names).
+
+    Names that had characters replaced get a short hash of the original
+    stem, so e.g. ``a-b.csv`` and ``a_b.csv`` never share fragments or cube
+    slices. Plain names are used as they are.
+    """
+    stem = Path(path).stem
+    token = re.sub(r"\W", "_", stem)
+    if token == stem:
+        return token
+    return f"{token}-{hashlib.sha256(stem.encode()).hexdigest()[:8]}"
+
+
+def csv_manifest_path(output_file: str | Path) -> Path:
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.stem + ".manifest.json")
+
+
+def _empty_manifest() -> dict:
+    return {"version": MANIFEST_VERSION, "files": {}}
+
+
+def _summary(changes) -> str:
+    return (
+        f"{len(changes.added)} added, {len(changes.changed)} changed, "
+        f"{len(changes.removed)} removed, {len(changes.unchanged)} unchanged"
+    )
+
+
+def _require_slices(changes, cube_dir):
+    """Treat unchanged files whose cube slice is missing as changed."""
+    missing = [f for f in changes.unchanged if not has_slice(cube_dir, source_token(f))]
+    if not missing:
+        return changes
+    return changes._replace(
+        changed=changes.changed + missing,
+        unchanged=[f for f in changes.unchanged if f not in missing],
+    )
+
+
+def _write_cube_slice(partials, cube_dir, token) -> None:
+    """Combine a worker's per-chunk cube partials and write its slice."""
+    if partials:
+        write_slice(aggregate(pd.concat(partials, ignore_index=True)), cube_dir, token)
+
+
+def map_files(worker, files, workers, *args) -> list:
+    """``[worker(file, *args) for file in files]``, in a process pool if asked.
+
+    Results keep the order of ``files`` either way.
+    """
+    if workers <= 1 or len(files) <= 1:
+        return [worker(file, *args) for file in files]
+
+    repeated = [itertools.repeat(a) for a in args]
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        return list(pool.map(worker, files, *repeated))
+
+
+# ===============================
+# CSV OUTPUT
+# ===============================
+def csv_part(file, kind, part_dir, cube_dir, memory_mb) -> dict:
+    """Worker: stream one state file into a headerless CSV part."""
+    token = source_token(file)
+    part = Path(part_dir) / f"{token}.csv"
+    rows, partials = 0, []
+
+    for chunk in iter_chunks(file, kind, memory_mb):
+        chunk.to_csv(part, mode="a", header=False, index=False)
+        partials.append(aggregate(to_columnar(chunk)))
+        rows += len(chunk)
+
+    _write_cube_slice(partials, cube_dir, token)
+    return source_entry(file, rows)
+
+
+def _concat_parts(files, part_dir, out) -> None:
+    for file in files:
+        with open(Path(part_dir) / f"{source_token(file)}.csv", "rb") as part:
+            shutil.copyfileobj(part, out)
+
+
+def merge_csv(input_folder, output_file, cube_dir, kind, full=False,
+              memory_mb=DEFAULT_MEMORY_MB, workers=1) -> dict:
+    output_file = Path(output_file)
+    manifest_path = csv_manifest_path(output_file)
+
+    manifest = _empty_manifest()
+    if output_file.exists() and not full:
+        manifest = load_manifest(manifest_path)
+
+    files = source_files(input_folder)
+    changes = _require_slices(diff_sources(files, manifest), cube_dir)
+    print("Sources:", _summary(changes))
+
+    rebuild = not manifest["files"] or bool(changes.stale)
+    if rebuild:
+        manifest = _empty_manifest()
+    pending = files if rebuild else changes.added
+
+    with tempfile.TemporaryDirectory(dir=output_file.parent) as part_dir:
+        entries = map_files(
+            csv_part, pending, workers,
+            kind, part_dir, cube_dir, memory_mb / max(workers, 1)
+        )
+
+        if rebuild:
+            # Assemble into a temporary file so a failed merge keeps the old output
+            tmp = output_file.with_name(output_file.name + ".tmp")
+            pd.DataFrame(columns=SCHEMAS[kind]).to_csv(tmp, index=False)
+            with open(tmp, "ab") as out:
+                _concat_parts(pending, part_dir, out)
+            os.replace(tmp, output_file)
+        else:
+            with open(output_file, "ab") as out:
+                _concat_parts(pending, part_dir, out)
+
+    for file, entry in zip(pending, entries):
+        manifest["files"][file.name] = entry
+
+    prune_slices(cube_dir, {source_token(f) for f in files})
+    index_slices(cube_dir)
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+
+# ===============================
+# PARQUET OUTPUT
+# ===============================
+def parquet_part(file, kind, store_dir, cube_dir, memory_mb) -> dict:
+    """Worker: stream one state file into its own fragments of the store."""
+    rows, fragments, partitions, partials = 0, [], {}, []
+    token = source_token(file)
+
+    for n, chunk in enumerate(iter_chunks(file, kind, memory_mb)):
+        columnar = to_columnar(chunk)
+        fragments += write_store(columnar, store_dir, source=f"{token}-{n}")
+        partials.append(aggregate(columnar))
+        rows += len(chunk)
+
+        counts = columnar.groupby(["state", "month"], observed=True).size()
+        for (state, month), n_rows in counts.items():
+            key = f"{state}/{month}"
+            partitions[key] = partitions.get(key, 0) + int(n_rows)
+
+    _write_cube_slice(partials, cube_dir, token)
+    return source_entry(
+        file, rows, fragments=sorted(fragments), partitions=partitions
+    )
+
+
+def merge_parquet(input_folder, store_dir, cube_dir, kind, full=False,
+                  memory_mb=DEFAULT_MEMORY_MB, workers=1) -> dict:
+    store_dir = Path(store_dir)
+    manifest_path = store_dir / MANIFEST_NAME
+
+    manifest = load_manifest(manifest_path)
+    if full or not manifest["files"]:
+        # Without a manifest the store's fragments cannot be traced back to
+        # their source files, so start over
+        shutil.rmtree(store_dir, ignore_errors=True)
+        manifest = _empty_manifest()
+
+    files = source_files(input_folder)
+    changes = _require_slices(diff_sources(files, manifest), cube_dir)
+    print("Sources:", _summary(changes))
+
+    for name in changes.stale:
+        delete_fragments(store_dir, manifest["files"].pop(name)["fragments"])
+
+    # Workers write distinct fragment names, so they never touch each
+    # other's files even inside a shared partition
+    store_dir.mkdir(parents=True, exist_ok=True)
+    entries = map_files(
+        parquet_part, changes.pending, workers,
+        kind, store_dir, cube_dir, memory_mb / max(workers, 1)
+    )
+    for file, entry in zip(changes.pending, entries):
+        manifest["files"][file.name] = entry
+
+    prune_slices(cube_dir, {source_token(f) for f in files})
+    index_slices(cube_dir)
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+
+def rows_by_state(manifest: dict) -> dict[str, int]:
+    """Combine the workers' per-partition row counts into totals per state."""
+    totals = {}
+    for entry in manifest["files"].values():
+        for key, n_rows in entry.get("partitions", {}).items():
+            state = key.rsplit("/", 1)[0]
+            totals[state] = totals.get(state, 0) + n_rows
+    return dict(sorted(totals.items()))
+
+
+# ===============================
+# COMMAND LINE
+# ===============================
+def run(label, input_folder, output_file, store_dir, cube_dir, argv=None):
+    parser = argparse.ArgumentParser(
+        description=f"Merge {label} state files into all-India outputs."
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="csv: merged CSV (default); parquet: partitioned columnar store",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the manifest and rebuild the output from scratch",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=float,
+        default=DEFAULT_MEMORY_MB,
+        metavar="MB",
+        help=f"memory cap for the chunked reader (default {DEFAULT_MEMORY_MB})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="state files processed in parallel (default 1)",
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="also publish the merged table as a shared memory-mapped file",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.format in ("csv", "both"):
+            manifest = merge_csv(
+                input_folder, output_file, cube_dir, label,
+                full=args.full, memory_mb=args.max_memory, workers=args.workers
+            )
+            rows = sum(e["rows"] for e in manifest["files"].values())
+            print(f"Merged {label} data rows:", rows)
+            print("Saved:", output_file)
+
+        if args.format in ("parquet", "both"):
+            manifest = merge_parquet(
+                input_folder, store_dir, cube_dir, label,
+                full=args.full, memory_mb=args.max_memory, workers=args.workers
+            )
+            rows = sum(e["rows"] for e in manifest["files"].values())
+            print(f"Columnar {label} rows:", rows)
+            for state, n in rows_by_state(manifest).items():
+                print(f"  {state}: {n}")
+            print("Saved:", store_dir)
+
+        print("Cube:", cube_dir)
+
+        if args.publish:
+            if args.format == "csv":
+                merged = load_pincode_day_csv(output_file)
+            else:
+                merged = load_store(store_dir)
+            shared = KINDS[label]["shared"]
+            rows = publish(merged, shared)
+            print(f"Published {label} rows:", rows)
+            print("Shared:", shared)
+    except SchemaError as exc:
+        parser.exit(1, f"Schema error: {exc}\n")
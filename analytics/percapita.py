@@ -0,0 +1,113 @@
+"""Per-capita update pressure: update volumes joined with state population.
+
+Raw update totals mostly mirror population size, so the biggest states always
+top the rankings. :func:`per_capita` divides each state's updates by its 2024
+population (``data/state_population.csv``) to give updates per 1,000
+residents, and an index against the rate of all states in the data together
+(100 = average).
+
+The two sources spell states differently (``Delhi (UT)`` vs ``Delhi``,
+``Jammu & Kashmir`` vs ``Jammu and Kashmir``, older names such as
+``Orissa``), so both sides are joined on :func:`state_key` instead of the raw
+name. Keys are computed once per distinct name, not per row.
+"""
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+PER = 1000
+
+# Alternative spellings and former names, by normalised key
+ALIASES = {
+    "orissa": "odisha",
+    "pondicherry": "puducherry",
+    "uttaranchal": "uttarakhand",
+    "westbengal": "west bengal",
+    "west bangal": "west bengal",
+    "tamilnadu": "tamil nadu",
+    "chhatisgarh": "chhattisgarh",
+    "nct of delhi": "delhi",
+    "jammu kashmir": "jammu and kashmir",
+    "andaman nicobar islands": "andaman and nicobar islands",
+    "andaman and nicobar": "andaman and nicobar islands",
+    "the dadra and nagar haveli and daman and diu": "dadra and nagar haveli and daman and diu",
+    # Merged into one UT in 2020
+    "dadra and nagar haveli": "dadra and nagar haveli and daman and diu",
+    "daman and diu": "dadra and nagar haveli and daman and diu",
+}
+
+_UT_SUFFIX = re.compile(r"\(\s*ut\s*\)")
+_SEPARATORS = re.compile(r"[^a-z]+")
+
+
+# ===============================
+# STATE NAMES
+# ===============================
+def state_key(name) -> str:
+    """Join key for a state name: lower case, no ``(UT)``, ``&`` as ``and``."""
+    key = _UT_SUFFIX.sub(" ", str(name).lower()).replace("&", " and ")
+    key = _SEPARATORS.sub(" ", key).strip()
+    return ALIASES.get(key, key)
+
+
+def state_keys(names: pd.Series) -> pd.Series:
+    """:func:`state_key` of every entry, computed once per distinct name."""
+    codes, uniques = pd.factorize(names.astype("string"))
+    keys = np.array([state_key(name) for name in uniques] + [""], dtype=object)
+    return pd.Series(keys[codes], index=names.index, name="key")
+
+
+# ===============================
+# INDEX
+# ===============================
+def per_capita(updates: pd.DataFrame, population: pd.DataFrame,
+               measures=("Biometric_Updates", "Demographic_Updates")) -> pd.DataFrame:
+    """Updates per ``PER`` residents for every state with a known population.
+
+    ``updates`` has a ``state`` column and one column per measure;
+    ``population`` is :func:`analytics.data.load_population`. Returns one row
+    per state, busiest per capita first: ``state``, ``key`` (its
+    :func:`state_key`, for lookups), ``Population``, the measures,
+    ``Total_Updates``, ``<measure>_Per_1000`` for each, ``Per_1000``,
+    ``Index`` (100 = rate of all matched states together) and ``Rank``. States missing from
+    ``population`` are left out; see :func:`unmatched`.
+    """
+    measures = list(measures)
+    totals = updates.assign(key=state_keys(updates["state"]))
+    totals["state"] = totals["state"].astype(str)
+    totals = totals.groupby("key", as_index=False).agg(
+        state=("state", "first"), **{m: (m, "sum") for m in measures}
+    )
+
+    people = population.assign(key=state_keys(population["State_Union_Territory"]))
+    people = people.groupby("key", as_index=False)["Population_2024"].sum()
+
+    table = totals.merge(people, on="key", how="inner").rename(
+        columns={"Population_2024": "Population"}
+    )
+    table["Total_Updates"] = table[measures].sum(axis=1)
+
+    residents = table["Population"].to_numpy(dtype="float64")
+    for column in measures + ["Total_Updates"]:
+        name = "Per_1000" if column == "Total_Updates" else f"{column}_Per_1000"
+        table[name] = np.divide(
+            table[column].to_numpy(dtype="float64") * PER, residents,
+            out=np.full(len(table), np.nan), where=residents > 0,
+        )
+
+    national = table["Total_Updates"].sum() * PER / max(table["Population"].sum(), 1)
+    table["Index"] = table["Per_1000"] / national * 100 if national > 0 else np.nan
+
+    table = table.sort_values("Per_1000", ascending=False, ignore_index=True)
+    table["Rank"] = np.arange(1, len(table) + 1)
+    return table[["state", "key"] + [c for c in table.columns if c not in ("state", "key")]]
+
+
+def unmatched(updates: pd.DataFrame, population: pd.DataFrame) -> list[str]:
+    """State names in ``updates`` with no population entry."""
+    known = set(state_keys(population["State_Union_Territory"]))
+    names = pd.Series(updates["state"].astype(str).unique())
+    return sorted(names[~state_keys(names).isin(known)])
@@ -0,0 +1,129 @@
+"""Pincode-level index over the raw update tables.
+
+For each update kind the raw rows are summed over age bands into one row per
+``state`` x ``district`` x ``pincode`` x ``date`` and sorted in that order
+(see :func:`analytics.cube.indexed`). A district's pincodes are then a
+contiguous block found by binary search, so drill-downs and top-K queries
+only touch that district's rows, not the national table.
+
+A small pincode -> state/district map, sorted by pincode, answers reverse
+lookups the same way.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from analytics.compact import with_dates
+from analytics.cube import KINDS, indexed, load_cube, raw_source, select
+from analytics.data import cached
+
+KEYS = ["state", "district", "pincode", "date"]
+
+
+# ===============================
+# INDEX BUILDING
+# ===============================
+@cached
+def _pincode_days(source, kind: str) -> pd.DataFrame:
+    # ``source`` only keys the cache; the loader picks store or CSV itself
+    spec = KINDS[kind]
+    measure = spec["measure"]
+
+    by = ["state", "district", "pincode", "day"]
+    rows = spec["load"](columns=by + spec["counts"])
+    rows[measure] = rows[spec["counts"]].sum(axis=1).astype("int64")
+
+    daily = (
+        rows.groupby(by, observed=True, sort=False)[measure]
+        .sum()
+        .reset_index()
+    )
+    return indexed(with_dates(daily), KEYS)
+
+
+def pincode_days(kind: str) -> pd.DataFrame:
+    """Per-pincode daily totals for ``kind``, indexed by state and district."""
+    return _pincode_days(raw_source(kind), kind)
+
+
+@cached
+def _pincode_map(source, kind: str) -> pd.DataFrame:
+    days = _pincode_days(source, kind)
+    return (
+        days[["pincode", "state", "district"]]
+        .drop_duplicates()
+        .sort_values("pincode", ignore_index=True)
+    )
+
+
+def latest_date() -> pd.Timestamp:
+    """Last day present in any cube; anchors "last N days" windows."""
+    return max(load_cube(kind)["date"].max() for kind in KINDS)
+
+
+# ===============================
+# QUERIES
+# ===============================
+def district_pincodes(state: str, district: str, days: int | None = 30) -> pd.DataFrame:
+    """Daily rows for every pincode of one district, both update kinds.
+
+    ``days`` keeps only the last ``days`` days up to :func:`latest_date`
+    (``None`` keeps everything). Columns: ``pincode``, ``date``,
+    ``Biometric_Updates``, ``Demographic_Updates``.
+    """
+    start = None
+    if days is not None:
+        start = latest_date() - pd.Timedelta(days=days - 1)
+
+    parts = []
+    for kind, spec in KINDS.items():
+        rows = select(pincode_days(kind), state, district)
+        if start is not None:
+            rows = rows[rows["date"] >= start]
+        parts.append(rows.set_index(["pincode", "date"])[spec["measure"]])
+
+    df = pd.concat(parts, axis=1).fillna(0).astype("int64")
+    return df.reset_index()
+
+
+def top_pincodes(state: str, district: str, k: int = 50, days: int | None = 30) -> pd.DataFrame:
+    """The ``k`` busiest pincodes of a district over the last ``days`` days."""
+    daily = district_pincodes(state, district, days)
+
+    measures = [spec["measure"] for spec in KINDS.values()]
+    df = daily.groupby("pincode", as_index=False)[measures].sum()
+    df["Total_Updates"] = df[measures].sum(axis=1)
+    return df.nlargest(k, "Total_Updates").reset_index(drop=True)
+
+
+def lookup(pincode: int) -> pd.DataFrame:
+    """State(s) and district(s) a pincode reports under, from either kind.
+
+    A pincode can appear under more than one district spelling, so every
+    match is returned.
+    """
+    matches = []
+    for kind in KINDS:
+        mapping = _pincode_map(raw_source(kind), kind)
+        pins = mapping["pincode"].to_numpy()
+        lo, hi = np.searchsorted(pins, [pincode, pincode + 1])
+        matches.append(mapping.iloc[lo:hi])
+
+    df = pd.concat(matches, ignore_index=True)
+    df["state"] = df["state"].astype(str)
+    df["district"] = df["district"].astype(str)
+    return df.drop_duplicates().reset_index(drop=True)
+
+
+def pincode_history(pincode: int) -> pd.DataFrame:
+    """Daily totals of one pincode across the districts it reports under."""
+    frames = []
+    for row in lookup(pincode).itertuples():
+        daily = district_pincodes(row.state, row.district, days=None)
+        frames.append(daily[daily["pincode"] == pincode].assign(
+            state=row.state, district=row.district
+        ))
+    if not frames:
+        return pd.DataFrame(columns=["pincode", "date", "state", "district"])
+    return pd.concat(frames, ignore_index=True)
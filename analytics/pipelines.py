@@ -0,0 +1,473 @@
+"""Headless page computations: tables and headline metrics for every page.
+
+Each page's data work lives here as plain functions of the page's inputs
+(a state, a forecast model), so it can be reused, benchmarked and
+precomputed without Streamlit; the pages only render the results.
+
+Table functions are persisted through :mod:`analytics.disk_cache`, keyed on
+the fingerprints of the files they read, so Streamlit replicas share them and
+pick up new data automatically. Metric functions return small dicts computed
+from those tables.
+"""
+from __future__ import annotations
+
+import functools
+
+import pandas as pd
+
+from analytics import percapita, temporal
+from analytics.anomaly import ALERT_COLUMNS, STATE_DIR, SurgeDetector, refresh
+from analytics.concentration import concentration, lorenz
+from analytics.cube import available, source_path
+from analytics.data import (
+    ENROLMENT_FILE,
+    GENERATION_FILE,
+    POPULATION_FILE,
+    UPDATES_FILE,
+    cached,
+    file_key,
+    load_enrolments,
+    load_generation,
+    load_population,
+    load_updates,
+)
+from analytics.disk_cache import disk_cached
+from analytics.forecast import forecast_table, monthly_matrix
+from analytics.pincode import latest_date
+from analytics.query import totals
+
+BIOMETRIC_SOURCE = functools.partial(source_path, "biometric")
+DEMOGRAPHIC_SOURCE = functools.partial(source_path, "demographic")
+
+SURGE_STATE = STATE_DIR / "district_surges.npz"
+
+
+# ===============================
+# PAGE 01 — DATA LANDSCAPE
+# ===============================
+@disk_cached(GENERATION_FILE)
+def aadhaar_growth() -> pd.DataFrame:
+    """Cumulative Aadhaar generated by month (``req_month``, ``cumulative``)."""
+    return load_generation()[["req_month", "cumulative"]].reset_index(drop=True)
+
+
+def coverage_metrics() -> dict:
+    """Latest cumulative Aadhaar generated against the 2024 population."""
+    generated = aadhaar_growth()["cumulative"].iloc[-1]
+    population = load_population()["Population_2024"].sum()
+    return {
+        "Total_Generated": int(generated),
+        "Population": int(population),
+        "Coverage_Pct": generated / population * 100,
+    }
+
+
+# ===============================
+# PAGE 02 — TEMPORAL BEHAVIOUR
+# ===============================
+@disk_cached(UPDATES_FILE)
+def monthly_updates() -> pd.DataFrame:
+    """All-India monthly updates with ``MoM Change`` from the previous month."""
+    updates = load_updates().sort_values("Month-Year").reset_index(drop=True)
+    updates["MoM Change"] = updates["Value"].diff()
+    return updates
+
+
+def _state_calendar() -> temporal.Calendar:
+    """Daily updates (both kinds) of every state as a calendar matrix.
+
+    Empty until the state folders have been merged.
+    """
+    keys = ["state", "date"]
+    if not available():
+        empty = pd.DataFrame({"state": [], "date": pd.DatetimeIndex([]), "Total_Updates": []})
+        return temporal.calendar(empty, "state", "Total_Updates")
+
+    bio = totals("biometric", by=keys)
+    demo = totals("demographic", by=keys)
+
+    daily = pd.merge(bio, demo, on=keys, how="outer").fillna(0)
+    daily["state"] = daily["state"].astype(str)
+    daily["Total_Updates"] = daily["Biometric_Updates"] + daily["Demographic_Updates"]
+    return temporal.calendar(daily, "state", "Total_Updates")
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def state_monthly() -> pd.DataFrame:
+    """Monthly updates of every state with ``MoM_Pct`` and ``YoY_Pct``."""
+    return temporal.monthly(_state_calendar())
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def state_seasonality() -> pd.DataFrame:
+    """Day-of-week and month-of-year profile of every state."""
+    return temporal.seasonality(_state_calendar())
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def state_volatility() -> pd.DataFrame:
+    """Volatility, latest change and peaks of every state, most volatile first."""
+    table = temporal.summary(_state_calendar())
+    return table.sort_values("Daily_CV", ascending=False).reset_index(drop=True)
+
+
+def rhythm_metrics() -> dict:
+    volatility = state_volatility()
+    if volatility.empty:
+        return {"States": 0, "Most_Volatile": None, "Common_Peak_Weekday": None}
+    return {
+        "States": len(volatility),
+        "Most_Volatile": volatility["state"].iloc[0],
+        "Common_Peak_Weekday": volatility["Peak_Weekday"].mode().iloc[0],
+    }
+
+
+# ===============================
+# PAGE 03 — UPDATE DOMINANCE
+# ===============================
+@disk_cached(UPDATES_FILE, ENROLMENT_FILE)
+def update_dominance() -> pd.DataFrame:
+    """Monthly enrolments vs updates with ``Update_to_Enrolment_Ratio``."""
+    updates_df = load_updates().rename(columns={"Value": "Updates"})
+    enrol_df = load_enrolments().rename(columns={"Month Values": "Enrolments"})
+
+    updates_df["Month"] = updates_df["Month-Year"]
+    enrol_df["Month"] = enrol_df["Period"]
+
+    df = pd.merge(
+        enrol_df[["Month", "Enrolments"]],
+        updates_df[["Month", "Updates"]],
+        on="Month",
+        how="inner"
+    )
+
+    df = df.sort_values("Month").reset_index(drop=True)
+    df["Update_to_Enrolment_Ratio"] = df["Updates"] / df["Enrolments"]
+    return df
+
+
+def dominance_metrics() -> dict:
+    """Average monthly enrolments, updates and update/enrolment ratio."""
+    df = update_dominance()
+    return {
+        "Avg_Enrolments": df["Enrolments"].mean(),
+        "Avg_Updates": df["Updates"].mean(),
+        "Avg_Ratio": df["Update_to_Enrolment_Ratio"].mean(),
+    }
+
+
+# ===============================
+# PAGE 04 — LIVING IDENTITY
+# ===============================
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def update_types_daily() -> pd.DataFrame:
+    """Daily biometric and demographic updates, days present in both kinds."""
+    bio = totals("biometric", by=["date"])
+    demo = totals("demographic", by=["date"])
+
+    df = pd.merge(bio, demo, on="date", how="inner")
+    return df.sort_values("date").reset_index(drop=True)
+
+
+def update_type_metrics() -> dict:
+    """Average daily updates of each kind and the ``Dominant`` one.
+
+    All ``None`` when no day has both update kinds.
+    """
+    df = update_types_daily()
+    if df.empty:
+        return dict.fromkeys(["Avg_Biometric", "Avg_Demographic", "Dominant"])
+    bio, demo = df["Biometric_Updates"].mean(), df["Demographic_Updates"].mean()
+    return {
+        "Avg_Biometric": bio,
+        "Avg_Demographic": demo,
+        "Dominant": "Biometric" if bio > demo else "Demographic",
+    }
+
+
+# ===============================
+# PAGE 05 — DISTRICT LEADERBOARD
+# ===============================
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def district_leaderboard(state: str) -> pd.DataFrame:
+    """Districts of ``state`` by total updates (outer join of both kinds)."""
+    bio_dist = totals("biometric", by=["district"], states=[state])
+    demo_dist = totals("demographic", by=["district"], states=[state])
+
+    df = (
+        pd.merge(bio_dist, demo_dist, on="district", how="outer")
+        .fillna(0)
+    )
+
+    df["Total_Updates"] = df["Biometric_Updates"] + df["Demographic_Updates"]
+    return df.sort_values("Total_Updates", ascending=False).reset_index(drop=True)
+
+
+def pressure_metrics(state: str) -> dict:
+    """Updates of each kind in ``state`` and the number of districts."""
+    df = district_leaderboard(state)
+    return {
+        "Biometric_Updates": int(df["Biometric_Updates"].sum()),
+        "Demographic_Updates": int(df["Demographic_Updates"].sum()),
+        "Districts": len(df),
+    }
+
+
+def district_mix(state: str, top_n: int = 15) -> pd.DataFrame:
+    """Long ``district`` / ``Update Type`` / ``Count`` rows for the top districts."""
+    return district_leaderboard(state).head(top_n).melt(
+        id_vars="district",
+        value_vars=["Biometric_Updates", "Demographic_Updates"],
+        var_name="Update Type",
+        value_name="Count"
+    )
+
+
+# ===============================
+# PAGE 06 — CONCENTRATION
+# ===============================
+def _district_totals() -> pd.DataFrame:
+    """Per-district updates of every state, both kinds (inner join)."""
+    bio_d = totals("biometric", by=["state", "district"])
+    demo_d = totals("demographic", by=["state", "district"])
+
+    df = pd.merge(bio_d, demo_d, on=["state", "district"], how="inner")
+    df["state"] = df["state"].astype(str)
+    df["district"] = df["district"].astype(str)
+    df["Total_Updates"] = df["Biometric_Updates"] + df["Demographic_Updates"]
+    return df
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def district_concentration() -> pd.DataFrame:
+    """Districts of every state ranked by load, with ``Cumulative_Share`` (%)."""
+    ranked = lorenz(_district_totals(), "state", "Total_Updates")
+    return ranked.rename(columns={"Rank": "District_Rank"})
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def state_concentration() -> pd.DataFrame:
+    """Top-20% share, Gini and HHI of district load, one row per state."""
+    return concentration(_district_totals(), "state", "Total_Updates")
+
+
+def concentration_curve(state: str) -> pd.DataFrame:
+    """Districts of ``state`` ranked by load with ``Cumulative_Share`` (%).
+
+    Only districts present in both update kinds are kept (inner join).
+    """
+    df = district_concentration()
+    return df[df["state"] == state].drop(columns="state").reset_index(drop=True)
+
+
+def concentration_metrics(state: str) -> dict:
+    """Top-20% share, Gini and HHI of ``state`` plus its update-type split (%).
+
+    All ``None`` when no district of ``state`` has both update kinds.
+    """
+    df = concentration_curve(state)
+    conc_df = state_concentration()
+    rows = conc_df[conc_df["state"] == state]
+    if df.empty or rows.empty:
+        return dict.fromkeys(
+            ["Top_20_Share", "Gini", "HHI", "Biometric_Share", "Demographic_Share"]
+        )
+
+    row = rows.iloc[0]
+
+    bio_share = df["Biometric_Updates"].sum() / df["Total_Updates"].sum() * 100
+    return {
+        "Top_20_Share": row["Top_20_Share"],
+        "Gini": row["Gini"],
+        "HHI": row["HHI"],
+        "Biometric_Share": bio_share,
+        "Demographic_Share": 100 - bio_share,
+    }
+
+
+def gini_ranking(state: str) -> pd.DataFrame:
+    """Every state's concentration, most concentrated first, with ``Selected``."""
+    df = state_concentration().sort_values("Gini", ascending=False)
+    df["Selected"] = df["state"] == state
+    return df.reset_index(drop=True)
+
+
+# ===============================
+# PAGES 05–06 — PER-CAPITA PRESSURE
+# ===============================
+def _state_updates() -> pd.DataFrame:
+    """Updates of each kind per state (outer join)."""
+    bio = totals("biometric", by=["state"])
+    demo = totals("demographic", by=["state"])
+    bio["state"] = bio["state"].astype(str)
+    demo["state"] = demo["state"].astype(str)
+    return pd.merge(bio, demo, on="state", how="outer").fillna(0)
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE, POPULATION_FILE)
+def state_per_capita() -> pd.DataFrame:
+    """Updates per 1,000 residents of every state, busiest per capita first."""
+    return percapita.per_capita(_state_updates(), load_population())
+
+
+def per_capita_coverage() -> dict:
+    """States with updates but no population entry, left out of the index."""
+    return {"Unmatched": percapita.unmatched(_state_updates(), load_population())}
+
+
+def per_capita_metrics(state: str) -> dict:
+    """``state``'s updates per 1,000 residents, index and rank among states."""
+    df = state_per_capita()
+    rows = df[df["key"] == percapita.state_key(state)]
+    if rows.empty:
+        return {"Per_1000": None, "Index": None, "Rank": None, "States": len(df), "Population": None}
+
+    row = rows.iloc[0]
+    return {
+        "Per_1000": row["Per_1000"],
+        "Index": row["Index"],
+        "Rank": int(row["Rank"]),
+        "States": len(df),
+        "Population": int(row["Population"]),
+    }
+
+
+def per_capita_ranking(state: str) -> pd.DataFrame:
+    """Every state's updates per 1,000 residents with ``Selected``."""
+    df = state_per_capita()
+    df["Selected"] = df["key"] == percapita.state_key(state)
+    return df
+
+
+# ===============================
+# PAGE 07 — FORECASTS
+# ===============================
+@disk_cached(UPDATES_FILE)
+def national_forecast(model: str = "exp_smoothing") -> pd.DataFrame:
+    """Monthly all-India updates plus next month's forecast and interval.
+
+    ``Series`` is ``"Actual"`` for history and ``"Forecast"`` for the added
+    month, whose ``Lower`` / ``Upper`` bound a 95% interval.
+    """
+    updates = load_updates().sort_values("Month-Year")
+    matrix = updates.set_index("Month-Year")["Value"].to_frame().T
+
+    row = forecast_table(matrix, model).iloc[0]
+    next_month = updates["Month-Year"].iloc[-1] + pd.DateOffset(months=1)
+
+    history = pd.DataFrame({
+        "Month": updates["Month-Year"],
+        "Updates": updates["Value"].astype("float64"),
+        "Series": "Actual",
+    })
+    forecast = pd.DataFrame({
+        "Month": [next_month],
+        "Updates": [row["Forecast"]],
+        "Lower": [row["Lower"]],
+        "Upper": [row["Upper"]],
+        "Series": ["Forecast"],
+    })
+    return pd.concat([history, forecast], ignore_index=True)
+
+
+def forecast_metrics(model: str = "exp_smoothing") -> dict:
+    """Next month's all-India forecast, its interval and change vs last month (%).
+
+    ``Month`` is the forecast month as ``YYYY-MM``.
+    """
+    df = national_forecast(model)
+    last = df.loc[df["Series"] == "Actual", "Updates"].iloc[-1]
+    nxt = df[df["Series"] == "Forecast"].iloc[0]
+    return {
+        "Month": str(nxt["Month"].to_period("M")),
+        "Forecast": nxt["Updates"],
+        "Lower": nxt["Lower"],
+        "Upper": nxt["Upper"],
+        "Change_Pct": (nxt["Updates"] / last - 1) * 100,
+    }
+
+
+def _district_daily() -> pd.DataFrame:
+    """Daily updates of every district, both kinds (outer join)."""
+    keys = ["state", "district", "date"]
+    bio = totals("biometric", by=keys)
+    demo = totals("demographic", by=keys)
+
+    daily = pd.merge(bio, demo, on=keys, how="outer").fillna(0)
+    daily["state"] = daily["state"].astype(str)
+    daily["district"] = daily["district"].astype(str)
+    daily["Total_Updates"] = daily["Biometric_Updates"] + daily["Demographic_Updates"]
+    return daily
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def district_monthly_load() -> pd.DataFrame:
+    """Monthly updates (both kinds) per district, one column per month."""
+    daily = _district_daily()
+    matrix = monthly_matrix(daily, ["state", "district"], "Total_Updates")
+    matrix.columns = matrix.columns.astype(str)
+    return matrix.rename_axis(columns=None).reset_index()
+
+
+@disk_cached(BIOMETRIC_SOURCE, DEMOGRAPHIC_SOURCE)
+def district_forecasts(model: str = "exp_smoothing") -> pd.DataFrame:
+    """Next month's update load for every district, busiest first.
+
+    ``Month`` is the forecast month: the one after the last month reported on
+    at least ``MIN_COVERAGE`` of its days (scaled up to the full month).
+    Empty until the state folders have been merged.
+    """
+    if not available():
+        return pd.DataFrame(columns=["state", "district", "Last", "Forecast", "Lower",
+                                     "Upper", "Change_Pct", "Month"])
+
+    matrix = district_monthly_load().set_index(["state", "district"])
+    table = forecast_table(matrix, model)
+    if matrix.shape[1]:
+        table["Month"] = str(pd.Period(matrix.columns[-1], freq="M") + 1)
+    return table.sort_values("Forecast", ascending=False).reset_index(drop=True)
+
+
+# ===============================
+# PAGE 05 — SURGE ALERTS
+# ===============================
+def _district_daily_matrix() -> pd.DataFrame:
+    return _district_daily().pivot_table(
+        index=["state", "district"], columns="date",
+        values="Total_Updates", aggfunc="sum", fill_value=0,
+    )
+
+
+def update_surges() -> SurgeDetector:
+    """Bring the surge detector saved in ``SURGE_STATE`` up to date.
+
+    Only new days in the data are processed. Run by
+    :func:`analytics.report.build` after each merge; pages only read the
+    saved alerts.
+    """
+    sources = [file_key(BIOMETRIC_SOURCE()), file_key(DEMOGRAPHIC_SOURCE())]
+    return refresh(_district_daily_matrix, SURGE_STATE, sources)
+
+
+@cached
+def _saved_alerts(path) -> pd.DataFrame:
+    return SurgeDetector.load(path).alerts()
+
+
+def surge_alerts() -> pd.DataFrame:
+    """Flagged district-days of total update load, oldest first.
+
+    Read from the detector saved by :func:`update_surges`; empty until that
+    has run.
+    """
+    if not SURGE_STATE.exists():
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+    return _saved_alerts(SURGE_STATE)
+
+
+def recent_surges(state: str, days: int = 30) -> pd.DataFrame:
+    """Surge alerts in ``state`` over the last ``days`` days of data, newest first."""
+    alerts = surge_alerts()
+    cutoff = latest_date() - pd.Timedelta(days=days - 1)
+    recent = alerts[(alerts["state"] == state) & (alerts["date"] >= cutoff)]
+    return recent.sort_values("date", ascending=False).reset_index(drop=True)
@@ -0,0 +1,230 @@
+"""Aggregate queries over the update tables, with an optional SQL backend.
+
+Pages and pipelines ask :func:`totals` for updates grouped by state, district,
+date or month. By default this is answered in pandas from the cached rollup
+cube (:func:`analytics.cube.totals`). Setting ``AADHAAR_QUERY_BACKEND``
+switches to an embedded SQL engine instead:
+
+- ``duckdb``: parameterised queries run directly on the merged Parquet cube
+  slices, the partitioned store or the merged CSV (in that order of
+  preference). Filters on ``state`` are pushed down to the scan, so for the
+  store only the selected partitions are read. Requires ``pip install duckdb``.
+- ``sqlite``: the cube is loaded once per process into an in-memory SQLite
+  table indexed on ``(state, district, date)``; needs only the standard
+  library.
+
+All backends return the same frame; ``python -m analytics.query`` checks this
+for the queries behind pages 04–06.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from analytics import cube
+from analytics.cube import KINDS, load_cube
+from analytics.data import file_key
+
+try:
+    import duckdb
+except ImportError:  # optional backend
+    duckdb = None
+
+BACKENDS = ["pandas", "duckdb", "sqlite"]
+
+BACKEND = os.environ.get("AADHAAR_QUERY_BACKEND", "pandas")
+
+GROUP_COLUMNS = ["state", "district", "date", "month"]
+
+
+# ===============================
+# SQL BUILDING
+# ===============================
+def _select_list(by, month_expr: str) -> list[str]:
+    unknown = [c for c in by if c not in GROUP_COLUMNS]
+    if unknown:
+        raise ValueError(f"cannot group by {unknown}; expected {GROUP_COLUMNS}")
+    return [f"{month_expr} AS month" if c == "month" else f'"{c}"' for c in by]
+
+
+def _aggregate_sql(relation: str, by, bands, states, month_expr: str):
+    """SQL text and parameters for one grouped sum."""
+    select = _select_list(by, month_expr)
+    measure = " + ".join(f'CAST("{b}" AS BIGINT)' for b in bands)
+    groups = ", ".join(str(i + 1) for i in range(len(by)))
+
+    sql = f"SELECT {', '.join(select)}, SUM({measure}) AS measure FROM {relation}"
+    params = []
+    if states is not None:
+        if not states:
+            sql += " WHERE 1 = 0"
+        else:
+            sql += f" WHERE state IN ({', '.join('?' * len(states))})"
+            params = list(states)
+    sql += f" GROUP BY {groups} ORDER BY {groups}"
+    return sql, params
+
+
+def _finish(df: pd.DataFrame, by, measure: str) -> pd.DataFrame:
+    """Match the dtypes and column names of :func:`analytics.cube.totals`."""
+    df = df.rename(columns={"measure": measure})
+    for col in by:
+        if col in ("date", "month"):
+            df[col] = pd.to_datetime(df[col])
+        else:
+            df[col] = df[col].astype(str)
+    df[measure] = df[measure].fillna(0).astype("int64")
+    return df.reset_index(drop=True)
+
+
+# ===============================
+# DUCKDB
+# ===============================
+def _quote(path: Path) -> str:
+    return "'" + path.as_posix().replace("'", "''") + "'"
+
+
+def _duckdb_relation(kind: str) -> str:
+    spec = KINDS[kind]
+    if any(spec["cube"].glob("*.parquet")):
+        return f"read_parquet({_quote(spec['cube'] / '*.parquet')})"
+    if spec["store"].is_dir():
+        return (
+            f"read_parquet({_quote(spec['store'] / '**' / '*.parquet')}, "
+            "hive_partitioning = true)"
+        )
+    return f"read_csv({_quote(spec['file'])}, dateformat = '%d-%m-%Y')"
+
+
+def _duckdb_totals(kind, by, states, bands) -> pd.DataFrame:
+    if duckdb is None:
+        raise RuntimeError("the duckdb query backend needs `pip install duckdb`")
+    sql, params = _aggregate_sql(
+        _duckdb_relation(kind), by, bands, states,
+        "CAST(date_trunc('month', \"date\") AS DATE)",
+    )
+    # A connection per call: DuckDB connections are not shared across threads
+    with duckdb.connect() as con:
+        return con.execute(sql, params).df()
+
+
+# ===============================
+# SQLITE
+# ===============================
+_sqlite: dict[str, tuple[tuple, sqlite3.Connection]] = {}
+_sqlite_lock = threading.Lock()
+
+
+def _sqlite_connection(kind: str) -> sqlite3.Connection:
+    """In-memory SQLite copy of the ``kind`` cube, rebuilt when its source changes."""
+    key = file_key(cube.source_path(kind))
+    cached = _sqlite.get(kind)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    rows = load_cube(kind)
+    rows = rows.assign(
+        state=rows["state"].astype(str),
+        district=rows["district"].astype(str),
+        date=rows["date"].dt.strftime("%Y-%m-%d"),
+    )
+
+    con = sqlite3.connect(":memory:", check_same_thread=False)
+    rows.to_sql(kind, con, index=False)
+    con.execute(f"CREATE INDEX {kind}_index ON {kind} (state, district, date)")
+    _sqlite[kind] = (key, con)
+    return con
+
+
+def _sqlite_totals(kind, by, states, bands) -> pd.DataFrame:
+    sql, params = _aggregate_sql(
+        kind, by, bands, states, "substr(date, 1, 7) || '-01'"
+    )
+    with _sqlite_lock:
+        con = _sqlite_connection(kind)
+        return pd.read_sql_query(sql, con, params=params)
+
+
+# ===============================
+# QUERIES
+# ===============================
+def totals(kind: str, by, states=None, age_bands=None, backend=None) -> pd.DataFrame:
+    """Updates summed over age bands and grouped ``by``; see :func:`analytics.cube.totals`.
+
+    ``backend`` overrides ``AADHAAR_QUERY_BACKEND`` for one call.
+    """
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown query backend {backend!r}; expected {BACKENDS}")
+    if backend == "pandas":
+        return cube.totals(kind, by, states=states, age_bands=age_bands)
+
+    spec = KINDS[kind]
+    by = list(by)
+    bands = list(age_bands) if age_bands is not None else spec["counts"]
+    states = list(states) if states is not None else None
+
+    run = _duckdb_totals if backend == "duckdb" else _sqlite_totals
+    return _finish(run(kind, by, states, bands), by, spec["measure"])
+
+
+# ===============================
+# PARITY CHECK
+# ===============================
+def page_queries(state: str) -> dict[str, tuple]:
+    """The aggregate queries behind pages 04–06, as ``totals`` arguments."""
+    queries = {}
+    for kind in KINDS:
+        queries[f"04 {kind} by date"] = (kind, ["date"], None)
+        queries[f"04 {kind} by month"] = (kind, ["month"], None)
+        queries[f"05 {kind} districts of {state}"] = (kind, ["district"], [state])
+        queries[f"06 {kind} by state and district"] = (kind, ["state", "district"], None)
+    return queries
+
+
+def parity(backend: str, state: str | None = None) -> dict[str, bool]:
+    """Whether ``backend`` returns the pandas result for each page query.
+
+    ``state`` defaults to the first state in the data. A query whose pandas
+    result is empty counts as a failure, since it would compare nothing.
+    """
+    if state is None:
+        state = next(iter(cube.states()), "")
+    results = {}
+    for name, (kind, by, states) in page_queries(state).items():
+        expected = totals(kind, by, states, backend="pandas")
+        if expected.empty:
+            results[name] = False
+            continue
+        actual = totals(kind, by, states, backend=backend)
+        for col in by:
+            if col not in ("date", "month"):
+                expected[col] = expected[col].astype(str)
+        try:
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+            results[name] = True
+        except AssertionError:
+            results[name] = False
+    return results
+
+
+def main(argv=None) -> int:
+    backends = (argv if argv is not None else sys.argv[1:]) or ["duckdb", "sqlite"]
+    ok = True
+    for backend in backends:
+        if backend == "duckdb" and duckdb is None:
+            print(f"{backend}: not installed, skipped")
+            continue
+        for name, same in parity(backend).items():
+            print(f"{backend}: {name}: {'ok' if same else 'MISMATCH'}")
+            ok &= same
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
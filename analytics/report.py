@@ -0,0 +1,339 @@
+"""Offline report: every page's tables, metrics and figures, precomputed.
+
+:func:`build` runs each entry of :data:`ARTIFACTS` once per state (or
+forecast model) and writes the results under ``REPORT_DIR``
+(default ``data/report``):
+
+- tables as Feather files (``<name>.feather``)
+- metrics as JSON (``<name>.json``)
+- Plotly figures as serialised figure JSON (``<name>.figure.json``)
+
+Entries that take a parameter get one file per value in a folder of their
+name, e.g. ``district_leaderboard/andhra_pradesh.feather``. A
+``manifest.json`` records the fingerprints of the source files the report was
+built from and the states it covers.
+
+The pages ask for their data through :func:`table`, :func:`metrics` and
+:func:`figure`. While the report matches the current sources, those only read
+the small precomputed files; otherwise (no report, or the data changed since
+it was built) they fall back to computing live, keeping live figures in
+memory until the sources change. Build it after each merge, e.g. nightly:
+
+    python build_report.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import pandas as pd
+import plotly.io as pio
+import pyarrow.feather as feather
+
+from analytics import figures, pipelines, timing
+from analytics.cube import available, source_path, states as cube_states
+from analytics.data import (
+    DATA_DIR,
+    ENROLMENT_FILE,
+    GENERATION_FILE,
+    POPULATION_FILE,
+    UPDATES_FILE,
+    cached,
+    file_key,
+)
+from analytics.forecast import MODELS
+
+REPORT_DIR = Path(os.environ.get("AADHAAR_REPORT_DIR", DATA_DIR / "report"))
+MANIFEST = "manifest.json"
+
+
+class Artifact(NamedTuple):
+    kind: str                   # "table", "metrics" or "figure"
+    compute: Callable
+    param: str | None = None    # "state" or "model"
+
+
+# ===============================
+# ARTIFACTS
+# ===============================
+ARTIFACTS = {
+    # Page 01
+    "aadhaar_growth": Artifact("table", pipelines.aadhaar_growth),
+    "coverage_metrics": Artifact("metrics", pipelines.coverage_metrics),
+
+    # Page 02
+    "update_trend": Artifact(
+        "figure", lambda: figures.update_trend(pipelines.monthly_updates())),
+    "update_change": Artifact(
+        "figure", lambda: figures.update_change(pipelines.monthly_updates())),
+    "state_monthly": Artifact("table", pipelines.state_monthly),
+    "state_volatility": Artifact("table", pipelines.state_volatility),
+    "rhythm_metrics": Artifact("metrics", pipelines.rhythm_metrics),
+    "weekday_rhythm": Artifact(
+        "figure",
+        lambda: figures.seasonality_heatmap(pipelines.state_seasonality(), "Weekday")),
+    "month_rhythm": Artifact(
+        "figure",
+        lambda: figures.seasonality_heatmap(pipelines.state_seasonality(), "Month")),
+    "volatility_ranking": Artifact(
+        "figure", lambda: figures.state_volatility(pipelines.state_volatility())),
+
+    # Page 03
+    "dominance_metrics": Artifact("metrics", pipelines.dominance_metrics),
+    "enrolments_vs_updates": Artifact(
+        "figure", lambda: figures.enrolments_vs_updates(pipelines.update_dominance())),
+    "dominance_ratio": Artifact(
+        "figure", lambda: figures.dominance_ratio(pipelines.update_dominance())),
+
+    # Page 04
+    "update_type_metrics": Artifact("metrics", pipelines.update_type_metrics),
+    "update_types_daily": Artifact("table", pipelines.update_types_daily),
+    "update_types": Artifact(
+        "figure", lambda: figures.update_types(pipelines.update_types_daily())),
+
+    # Page 05
+    "district_leaderboard": Artifact("table", pipelines.district_leaderboard, "state"),
+    "pressure_metrics": Artifact("metrics", pipelines.pressure_metrics, "state"),
+    "top_districts": Artifact(
+        "figure",
+        lambda state: figures.top_districts(pipelines.district_leaderboard(state).head(15)),
+        "state"),
+    "district_mix": Artifact(
+        "figure", lambda state: figures.district_mix(pipelines.district_mix(state)), "state"),
+    "recent_surges": Artifact("table", pipelines.recent_surges, "state"),
+
+    # Page 06
+    "concentration_curve": Artifact("table", pipelines.concentration_curve, "state"),
+    "concentration_metrics": Artifact("metrics", pipelines.concentration_metrics, "state"),
+    "concentration_figure": Artifact(
+        "figure",
+        lambda state: figures.concentration_curve(pipelines.concentration_curve(state)),
+        "state"),
+    "gini_ranking": Artifact(
+        "figure", lambda state: figures.gini_ranking(pipelines.gini_ranking(state)), "state"),
+
+    # Pages 05–06
+    "per_capita_metrics": Artifact("metrics", pipelines.per_capita_metrics, "state"),
+    "per_capita_coverage": Artifact("metrics", pipelines.per_capita_coverage),
+    "per_capita_ranking": Artifact(
+        "figure",
+        lambda state: figures.per_capita_ranking(pipelines.per_capita_ranking(state)),
+        "state"),
+
+    # Page 07
+    "forecast_metrics": Artifact("metrics", pipelines.forecast_metrics, "model"),
+    "national_forecast": Artifact(
+        "figure",
+        lambda model: figures.national_forecast(pipelines.national_forecast(model)),
+        "model"),
+    "district_forecasts": Artifact("table", pipelines.district_forecasts, "model"),
+}
+
+SUFFIXES = {"table": ".feather", "metrics": ".json", "figure": ".figure.json"}
+
+
+def sources() -> list[Path]:
+    """Every file the report is derived from."""
+    return [
+        GENERATION_FILE, UPDATES_FILE, ENROLMENT_FILE, POPULATION_FILE,
+        source_path("biometric"), source_path("demographic"),
+    ]
+
+
+def _fingerprint() -> list:
+    prints = []
+    for path in sources():
+        try:
+            prints.append(list(file_key(path)))
+        except FileNotFoundError:
+            prints.append([str(Path(path).resolve()), None, None])
+    return prints
+
+
+def _slug(value) -> str:
+    return re.sub(r"\W+", "_", str(value).lower()).strip("_")
+
+
+def artifact_path(name: str, value=None, root: str | Path = REPORT_DIR) -> Path:
+    spec = ARTIFACTS[name]
+    stem = Path(name) / _slug(value) if spec.param else Path(name)
+    return Path(root) / stem.with_name(stem.name + SUFFIXES[spec.kind])
+
+
+# ===============================
+# BUILD
+# ===============================
+def _json_value(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _write(spec: Artifact, result, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if spec.kind == "table":
+        feather.write_feather(result.reset_index(drop=True), tmp)
+    elif spec.kind == "metrics":
+        tmp.write_text(json.dumps(result, default=_json_value, indent=2), encoding="utf-8")
+    else:
+        tmp.write_text(pio.to_json(result, validate=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build(root: str | Path = REPORT_DIR, log=print) -> dict:
+    """Compute every artifact for every state and model; return the manifest.
+
+    The saved surge detector is brought up to date first, so the alert
+    tables cover the current data.
+    """
+    root = Path(root)
+    fingerprint = _fingerprint()
+    if available():
+        start = time.perf_counter()
+        pipelines.update_surges()
+        log(f"{'surge detector':<24} {time.perf_counter() - start:6.2f}s")
+    values = {"state": cube_states(), "model": MODELS}
+
+    count = 0
+    for name, spec in ARTIFACTS.items():
+        start = time.perf_counter()
+        for value in values[spec.param] if spec.param else [None]:
+            args = () if value is None else (value,)
+            _write(spec, spec.compute(*args), artifact_path(name, value, root))
+            count += 1
+        log(f"{name:<24} {time.perf_counter() - start:6.2f}s")
+
+    manifest = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "sources": fingerprint,
+        "states": values["state"],
+        "models": values["model"],
+        "artifacts": count,
+    }
+    tmp = root / f"{MANIFEST}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, root / MANIFEST)
+    return manifest
+
+
+# ===============================
+# READ
+# ===============================
+def _read_json(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@cached
+def _load_table(path: str | Path) -> pd.DataFrame:
+    return feather.read_feather(path)
+
+
+_loaded: dict[tuple, object] = {}
+
+
+def _load(path: Path, reader):
+    """``reader(path)``, reused while the file is unchanged."""
+    key = file_key(path)
+    if key not in _loaded:
+        for stale in [k for k in _loaded if k[0] == key[0]]:
+            del _loaded[stale]
+        _loaded[key] = reader(path)
+    return _loaded[key]
+
+
+def manifest(root: str | Path = REPORT_DIR) -> dict | None:
+    """The report's manifest if it exists and matches the current sources."""
+    path = Path(root) / MANIFEST
+    if not path.exists():
+        return None
+    current = _load(path, _read_json)
+    return current if current["sources"] == _fingerprint() else None
+
+
+def _precomputed(name: str, value, root):
+    report = manifest(root)
+    if report is None:
+        return None
+    path = artifact_path(name, value, root)
+    return path if path.exists() else None
+
+
+_live: dict[tuple, object] = {}
+
+
+def _fallback(name: str, value):
+    spec = ARTIFACTS[name]
+    if spec.kind != "figure":
+        with timing.stage(f"live {name}"):
+            return spec.compute(value) if spec.param else spec.compute()
+
+    # Tables and metrics are cached by the pipelines; figures are kept here
+    key = (name, value, repr(_fingerprint()))
+    if key not in _live:
+        for stale in [k for k in _live if k[:2] == key[:2]]:
+            del _live[stale]
+        with timing.stage(f"live {name}"):
+            _live[key] = spec.compute(value) if spec.param else spec.compute()
+    return _live[key]
+
+
+def table(name: str, value=None, root: str | Path = REPORT_DIR) -> pd.DataFrame:
+    path = _precomputed(name, value, root)
+    if path is None:
+        return _fallback(name, value)
+    with timing.stage(f"report {name}"):
+        return _load_table(path)
+
+
+def metrics(name: str, value=None, root: str | Path = REPORT_DIR) -> dict:
+    path = _precomputed(name, value, root)
+    if path is None:
+        return _fallback(name, value)
+    with timing.stage(f"report {name}"):
+        return dict(_load(path, _read_json))
+
+
+def figure(name: str, value=None, root: str | Path = REPORT_DIR):
+    """A Plotly figure; figures are shared between reruns, so do not modify them."""
+    path = _precomputed(name, value, root)
+    if path is None:
+        return _fallback(name, value)
+    with timing.stage(f"report {name}"):
+        return _load(path, lambda p: pio.from_json(p.read_text(encoding="utf-8"), skip_invalid=True))
+
+
+def states(root: str | Path = REPORT_DIR) -> list[str]:
+    """States with update data, from the report when it is current."""
+    report = manifest(root)
+    return list(report["states"]) if report else cube_states()
+
+
+# ===============================
+# CLI
+# ===============================
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute every page's tables, metrics and figures.")
+    parser.add_argument("--output", type=Path, default=REPORT_DIR,
+                        help=f"report directory (default {REPORT_DIR})")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even if the report matches the current data")
+    args = parser.parse_args(argv)
+
+    if not args.force and manifest(args.output) is not None:
+        print("Report is up to date:", args.output)
+        return
+
+    start = time.perf_counter()
+    report = build(args.output)
+    print(f"{report['artifacts']} artifacts for {len(report['states'])} states "
+          f"in {time.perf_counter() - start:.1f}s")
+    print("Saved:", args.output)
+
+
+if __name__ == "__main__":
+    main()
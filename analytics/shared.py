@@ -0,0 +1,116 @@
+"""Memory-mapped pincode-day tables shared by every Streamlit process.
+
+``merge_*_states.py --publish`` writes the merged table, in the compact layout
+of :mod:`analytics.compact`, to one uncompressed Arrow IPC file per kind
+(``data/<kind>_shared.arrow``). Each column is stored as a single contiguous
+buffer: ``state``, ``district`` and any other categorical column as codes
+(the category names live in the file's metadata), everything else as plain
+unsigned ints.
+
+Workers map the file read-only and wrap the buffers as NumPy arrays without
+copying, so the pages of the file live once in the OS page cache however many
+Streamlit processes read it, and a new process is ready without parsing
+anything. Rows are sorted by ``state``, ``district`` and ``day`` with sorted
+categories, so selecting a single state is a slice of the mapping rather than
+a copy.
+
+Publishing replaces the file atomically; processes that still map the old
+version keep reading it until their loaders see the new one.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+CATEGORICAL = ["state", "district"]
+
+METADATA_KEY = b"aadhaar.categories"
+
+
+# ===============================
+# PUBLISHING (MERGE TIME)
+# ===============================
+def publish(df: pd.DataFrame, path: str | Path) -> int:
+    """Write compact rows to ``path`` as a mappable Arrow IPC file.
+
+    Returns the number of rows written.
+    """
+    path = Path(path)
+
+    columns, categories = {}, {}
+    for col in df.columns:
+        if col not in CATEGORICAL and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        values = df[col].astype(str)
+        categories[col] = sorted(values.unique())
+        df = df.assign(**{col: pd.Categorical(values, categories=categories[col])})
+    df = df.sort_values(["state", "district", "day"], ignore_index=True)
+
+    for col in df.columns:
+        columns[col] = df[col].cat.codes if col in categories else df[col]
+
+    table = pa.table(columns).replace_schema_metadata(
+        {METADATA_KEY: json.dumps(categories).encode("utf-8")}
+    )
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            # One record batch, so every column is one contiguous buffer
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+    os.replace(tmp, path)
+    return len(table)
+
+
+# ===============================
+# MAPPING (PAGE TIME)
+# ===============================
+def _column(table: pa.Table, name: str) -> np.ndarray:
+    chunks = table.column(name).chunks
+    if not chunks:
+        return np.array([], dtype=table.schema.field(name).type.to_pandas_dtype())
+    return chunks[0].to_numpy(zero_copy_only=True)
+
+
+def _state_range(codes: np.ndarray, categories: list[str], state: str) -> slice:
+    if state not in categories:
+        return slice(0, 0)
+    code = categories.index(state)
+    lo, hi = np.searchsorted(codes, [code, code + 1])
+    return slice(int(lo), int(hi))
+
+
+def map_shared(path: str | Path, columns=None, states=None) -> pd.DataFrame:
+    """Selected ``columns`` / ``states`` of a published file, without copying.
+
+    Only asking for several states copies their rows into one frame.
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    categories = json.loads(table.schema.metadata[METADATA_KEY])
+
+    rows = [slice(None)]
+    if states is not None:
+        state_codes = _column(table, "state")
+        rows = [_state_range(state_codes, categories["state"], s) for s in states]
+
+    frame = {}
+    for col in columns if columns is not None else table.column_names:
+        values = _column(table, col)
+        parts = [values[r] for r in rows]
+        if len(parts) == 1:
+            values = parts[0]
+        else:
+            values = np.concatenate(parts) if parts else values[:0]
+        if col in categories:
+            values = pd.Categorical.from_codes(
+                values, categories=categories[col], validate=False
+            )
+        frame[col] = values
+
+    # copy=False keeps one block per column, backed by the mapping
+    return pd.DataFrame(frame, copy=False)
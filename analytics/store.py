@@ -0,0 +1,149 @@
+"""Columnar snapshot store for the merged pincode-day update tables.
+
+The merge scripts can write their output as a Parquet dataset partitioned by
+``state`` and ``month`` (hive layout, e.g. ``state=Kerala/month=2025-03/``).
+Compared with the merged CSVs:
+
+- ``date`` is stored pre-parsed as a calendar date
+- ``state`` and ``district`` are dictionary-encoded
+- ``pincode`` and the ``*_age_*`` counts are ``uint32`` instead of ``int64``
+
+Readers pick the columns and states they need, and pyarrow prunes the other
+partitions without opening their files.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from analytics.dates import parse_dates
+
+PARTITION_COLUMNS = ["state", "month"]
+
+# Partition values come back dictionary-encoded when reading
+PARTITIONING = ds.HivePartitioning.discover(infer_dictionary=True)
+
+DATE_FORMAT = "%d-%m-%Y"
+
+
+def count_columns(columns) -> list[str]:
+    """The age-band count columns (``bio_age_*`` / ``demo_age_*``)."""
+    return [c for c in columns if "_age_" in c]
+
+
+def file_schema(counts: list[str]) -> pa.Schema:
+    """Schema of the Parquet files (partition columns live in the path)."""
+    return pa.schema(
+        [
+            ("date", pa.date32()),
+            ("district", pa.dictionary(pa.int32(), pa.string())),
+            ("pincode", pa.uint32()),
+        ]
+        + [(c, pa.uint32()) for c in counts]
+    )
+
+
+# ===============================
+# RAW ROWS -> COLUMNAR
+# ===============================
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise raw state rows to the store's types.
+
+    Rows whose date does not parse are dropped, matching the CSV loaders.
+    """
+    counts = count_columns(df.columns)
+
+    out = pd.DataFrame({
+        "date": parse_dates(df["date"], DATE_FORMAT),
+        "state": df["state"].astype("category"),
+        "district": df["district"].astype("category"),
+        "pincode": df["pincode"].astype("uint32"),
+    })
+    for c in counts:
+        out[c] = df[c].fillna(0).astype("uint32")
+
+    out = out.dropna(subset=["date"]).reset_index(drop=True)
+
+    # Format each distinct day once; strftime per row dominates otherwise
+    codes, days = pd.factorize(out["date"])
+    out["month"] = days.strftime("%Y-%m").take(codes)
+    return out
+
+
+def write_store(df: pd.DataFrame, root: str | Path, source=None) -> list[str]:
+    """Write columnar rows as a ``state``/``month`` partitioned dataset.
+
+    Without ``source`` the partitions present in ``df`` are replaced. With
+    ``source`` the rows are written as ``<source>-<i>.parquet`` fragments next
+    to whatever the partitions already hold, so each source file's rows can
+    later be replaced or removed on their own.
+
+    Returns the written file paths, relative to ``root``.
+    """
+    counts = count_columns(df.columns)
+    schema = file_schema(counts)
+
+    table = pa.Table.from_pandas(
+        df[[f.name for f in schema]], preserve_index=False
+    ).cast(schema)
+    table = table.append_column("state", pa.array(df["state"].astype(str)))
+    table = table.append_column("month", pa.array(df["month"].astype(str)))
+
+    if source is None:
+        basename = "part-{i}.parquet"
+        existing = "delete_matching"
+    else:
+        basename = f"{source}-{{i}}.parquet"
+        existing = "overwrite_or_ignore"
+
+    written = []
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=PARTITION_COLUMNS,
+        partitioning_flavor="hive",
+        existing_data_behavior=existing,
+        basename_template=basename,
+        max_partitions=4096,
+        file_visitor=lambda f: written.append(os.path.relpath(f.path, root)),
+    )
+    return sorted(written)
+
+
+def delete_fragments(root: str | Path, fragments) -> None:
+    """Remove fragment files (relative to ``root``) and emptied partitions."""
+    root = Path(root)
+    for rel in fragments:
+        path = root / rel
+        path.unlink(missing_ok=True)
+        for parent in path.parents:
+            if parent == root or not parent.is_dir() or any(parent.iterdir()):
+                break
+            parent.rmdir()
+
+
+# ===============================
+# COLUMNAR -> PANDAS
+# ===============================
+def open_store(root: str | Path) -> ds.Dataset:
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def read_store(root: str | Path, columns=None, states=None) -> pd.DataFrame:
+    """Load selected ``columns`` for selected ``states`` (``None`` = all)."""
+    dataset = open_store(root)
+
+    flt = None
+    if states is not None:
+        flt = ds.field("state").isin(list(states))
+
+    table = dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=flt,
+    )
+    return table.to_pandas(date_as_object=False)
@@ -0,0 +1,219 @@
+"""Temporal analytics for many states at once.
+
+Daily update totals are laid out once as a dense ``groups x days`` matrix
+covering every calendar day from the first to the last date in the data
+(:func:`calendar`), together with a mask of the days reported anywhere. Every
+measure is then a grouped NumPy reduction over that matrix, never a loop over
+groups:
+
+- :func:`monthly`: monthly totals (``np.add.reduceat`` over month boundaries,
+  scaled for partially reported months as in :mod:`analytics.forecast`) with
+  month-over-month and year-over-year change
+- :func:`seasonality`: day-of-week and month-of-year profiles, i.e. mean
+  updates per reported day in each weekday / calendar month as an index of the
+  group's overall daily mean (100 = average)
+- :func:`summary`: volatility per group (coefficient of variation of daily
+  load, spread of month-over-month change) with its latest changes and peaks
+
+A day missing from one group but reported elsewhere counts as zero updates
+for that group; days reported nowhere are left out of every mean.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from analytics.forecast import MIN_COVERAGE, SEASON
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class Calendar(NamedTuple):
+    group: str                  # name of the group column, e.g. "state"
+    labels: np.ndarray          # one label per matrix row
+    days: pd.DatetimeIndex      # one calendar day per matrix column
+    values: np.ndarray          # groups x days, 0 where a group has no rows
+    reported: np.ndarray        # days present anywhere in the data
+
+
+# ===============================
+# CALENDAR MATRIX
+# ===============================
+def calendar(daily: pd.DataFrame, group: str, value: str) -> Calendar:
+    """Lay ``daily`` rows (``group``, ``date``, ``value``) out as a day matrix."""
+    codes, labels = pd.factorize(daily[group], sort=True)
+    day = daily["date"].to_numpy(dtype="datetime64[D]")
+    if not len(day):
+        return Calendar(group, np.asarray(labels), pd.DatetimeIndex([]),
+                        np.zeros((0, 0)), np.zeros(0, dtype=bool))
+
+    first = day.min()
+    size = int((day.max() - first).astype("int64")) + 1
+    column = (day - first).astype("int64")
+
+    # One bincount over flat (group, day) cells sums duplicate rows as well
+    values = np.bincount(
+        codes * size + column,
+        weights=np.asarray(daily[value], dtype="float64"),
+        minlength=len(labels) * size,
+    ).reshape(len(labels), size)
+    reported = np.bincount(column, minlength=size) > 0
+
+    days = pd.date_range(pd.Timestamp(first), periods=size, freq="D")
+    return Calendar(group, np.asarray(labels), days, values, reported)
+
+
+def _month_starts(cal: Calendar):
+    """Column index where each calendar month begins, and the months."""
+    ordinal = cal.days.year * 12 + cal.days.month - 1
+    starts = np.flatnonzero(np.r_[True, np.diff(ordinal) > 0])
+    months = pd.period_range(cal.days[0], cal.days[-1], freq="M")
+    return starts, months
+
+
+def _change(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Percentage change, NaN where the previous value is missing or zero."""
+    out = np.full(current.shape, np.nan)
+    valid = np.isfinite(current) & np.isfinite(previous) & (previous > 0)
+    np.divide(current - previous, previous, out=out, where=valid)
+    return out * 100
+
+
+def _monthly(cal: Calendar, min_coverage: float = MIN_COVERAGE):
+    """Months, scaled ``groups x months`` totals and their MoM / YoY change."""
+    starts, months = _month_starts(cal)
+    totals = np.add.reduceat(cal.values, starts, axis=1)
+    reported = np.add.reduceat(cal.reported.astype("int64"), starts)
+
+    coverage = reported / months.days_in_month.to_numpy()
+    scaled = np.where(coverage >= min_coverage, totals / np.maximum(coverage, 1e-9), np.nan)
+
+    mom = np.full(scaled.shape, np.nan)
+    mom[:, 1:] = _change(scaled[:, 1:], scaled[:, :-1])
+    yoy = np.full(scaled.shape, np.nan)
+    yoy[:, SEASON:] = _change(scaled[:, SEASON:], scaled[:, :-SEASON])
+    return months, scaled, mom, yoy
+
+
+def _profile(cal: Calendar, positions: np.ndarray, size: int) -> np.ndarray:
+    """Index (100 = average) of mean updates per reported day in each position."""
+    onehot = np.zeros((len(cal.days), size))
+    onehot[np.flatnonzero(cal.reported), positions[cal.reported]] = 1.0
+
+    sums = cal.values @ onehot
+    counts = onehot.sum(axis=0)
+    means = np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+    overall = cal.values[:, cal.reported].mean(axis=1) if cal.reported.any() else np.zeros(len(cal.labels))
+    return np.divide(means, overall[:, None], out=np.full(means.shape, np.nan),
+                     where=overall[:, None] > 0) * 100
+
+
+def _profiles(cal: Calendar) -> dict[str, tuple[list[str], np.ndarray]]:
+    return {
+        "Weekday": (WEEKDAYS, _profile(cal, cal.days.dayofweek.to_numpy(), 7)),
+        "Month": (MONTHS, _profile(cal, cal.days.month.to_numpy() - 1, 12)),
+    }
+
+
+# ===============================
+# MEASURES
+# ===============================
+def monthly(cal: Calendar, min_coverage: float = MIN_COVERAGE) -> pd.DataFrame:
+    """One row per group and sufficiently reported month.
+
+    Columns: the group, ``Month`` (``YYYY-MM``), ``Updates`` (scaled to the
+    full month), ``MoM_Pct`` and ``YoY_Pct`` (NaN without a comparable
+    earlier month).
+    """
+    columns = [cal.group, "Month", "Updates", "MoM_Pct", "YoY_Pct"]
+    if not len(cal.labels) or not len(cal.days):
+        return pd.DataFrame(columns=columns)
+
+    months, scaled, mom, yoy = _monthly(cal, min_coverage)
+    rows, cols = np.nonzero(np.isfinite(scaled))
+    return pd.DataFrame({
+        cal.group: cal.labels[rows],
+        "Month": months.astype(str).to_numpy()[cols],
+        "Updates": scaled[rows, cols],
+        "MoM_Pct": mom[rows, cols],
+        "YoY_Pct": yoy[rows, cols],
+    }, columns=columns)
+
+
+def seasonality(cal: Calendar) -> pd.DataFrame:
+    """Day-of-week and month-of-year profiles of every group, long format.
+
+    Columns: the group, ``Profile`` (``Weekday`` or ``Month``), ``Period``
+    (``Mon`` ... / ``Jan`` ...), ``Order`` (position within the profile) and
+    ``Index`` (100 = the group's average day; NaN for periods never
+    reported).
+    """
+    columns = [cal.group, "Profile", "Period", "Order", "Index"]
+    if not len(cal.labels) or not len(cal.days):
+        return pd.DataFrame(columns=columns)
+
+    frames = []
+    for profile, (periods, index) in _profiles(cal).items():
+        groups, order = len(cal.labels), len(periods)
+        frames.append(pd.DataFrame({
+            cal.group: np.repeat(cal.labels, order),
+            "Profile": profile,
+            "Period": np.tile(periods, groups),
+            "Order": np.tile(np.arange(order), groups),
+            "Index": index.ravel(),
+        }))
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+def summary(cal: Calendar, min_coverage: float = MIN_COVERAGE) -> pd.DataFrame:
+    """Volatility, latest change and seasonal peaks of every group.
+
+    Columns: the group, ``Daily_Mean`` (updates per reported day),
+    ``Daily_CV`` (standard deviation / mean of daily load), ``MoM_Volatility``
+    (standard deviation of month-over-month change, in percentage points),
+    ``Last_Month``, ``Last_MoM_Pct``, ``Last_YoY_Pct``, ``Peak_Weekday`` and
+    ``Peak_Month``.
+    """
+    columns = [cal.group, "Daily_Mean", "Daily_CV", "MoM_Volatility", "Last_Month",
+               "Last_MoM_Pct", "Last_YoY_Pct", "Peak_Weekday", "Peak_Month"]
+    if not len(cal.labels) or not cal.reported.any():
+        return pd.DataFrame(columns=columns)
+
+    daily = cal.values[:, cal.reported]
+    mean = daily.mean(axis=1)
+    cv = np.divide(daily.std(axis=1), mean, out=np.full(mean.shape, np.nan), where=mean > 0)
+
+    months, scaled, mom, yoy = _monthly(cal, min_coverage)
+    kept = np.flatnonzero(np.isfinite(scaled).any(axis=0))
+    last = kept[-1] if len(kept) else None
+
+    # Spread of the month-over-month changes each group has (at least two)
+    valid = np.isfinite(mom)
+    count = valid.sum(axis=1)
+    changes = np.where(valid, mom, 0.0)
+    centre = np.divide(changes.sum(axis=1), count, out=np.zeros(len(count)), where=count > 0)
+    squares = np.where(valid, (mom - centre[:, None]) ** 2, 0.0).sum(axis=1)
+    spread = np.sqrt(np.divide(squares, count, out=np.full(len(count), np.nan), where=count > 1))
+
+    peaks = {}
+    for profile, (periods, index) in _profiles(cal).items():
+        filled = np.where(np.isfinite(index), index, -np.inf)
+        peaks[profile] = np.where(np.isfinite(index).any(axis=1),
+                                  np.asarray(periods)[filled.argmax(axis=1)], None)
+
+    return pd.DataFrame({
+        cal.group: cal.labels,
+        "Daily_Mean": mean,
+        "Daily_CV": cv,
+        "MoM_Volatility": spread,
+        "Last_Month": str(months[last]) if last is not None else None,
+        "Last_MoM_Pct": mom[:, last] if last is not None else np.nan,
+        "Last_YoY_Pct": yoy[:, last] if last is not None else np.nan,
+        "Peak_Weekday": peaks["Weekday"],
+        "Peak_Month": peaks["Month"],
+    }, columns=columns)
@@ -0,0 +1,242 @@
+"""Per-rerun timing for the pages, with optional profiling.
+
+Every page calls :func:`start` right after ``st.set_page_config`` and
+:func:`finish` at the end of the script (a rerun cut short by ``st.stop()``
+is not logged). In between, :func:`mark` closes the stage that just ran
+(``"css"``, ``"load"``, ``"render"`` ...), so the page is split into
+consecutive timed stages without re-indenting it. Hot paths inside
+:mod:`analytics` (file parses, disk-cache reads and recomputes, report reads)
+are recorded with :func:`stage` as nested calls of whichever rerun is active
+in the current thread; with no active rerun they cost one attribute lookup.
+Page sections wrapped in ``st.fragment`` time themselves with
+:func:`fragment`: a call of the full rerun, or a rerun of its own when
+Streamlit reruns just the fragment.
+
+:func:`finish` writes one JSON log line per rerun to the ``aadhaar.timing``
+logger (stderr by default; ``AADHAAR_TIMING_LOG=0`` turns it off). Opt-in
+extras:
+
+- ``AADHAAR_DEBUG=1`` or ``?debug=1`` in the page URL shows the timings in a
+  sidebar panel
+- ``AADHAAR_PROFILER=cprofile`` (or ``pyinstrument``, after
+  ``pip install pyinstrument``) profiles every rerun and saves the profile
+  under ``AADHAAR_PROFILE_DIR`` (default ``.cache/profiles``); the debug
+  panel shows its top entries
+"""
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import pyinstrument
+except ImportError:  # optional profiler
+    pyinstrument = None
+
+PROFILERS = ["", "cprofile", "pyinstrument"]
+
+PROFILER = os.environ.get("AADHAAR_PROFILER", "")
+PROFILE_DIR = Path(os.environ.get("AADHAAR_PROFILE_DIR", ".cache/profiles"))
+DEBUG = os.environ.get("AADHAAR_DEBUG", "0") not in ("", "0")
+LOG = os.environ.get("AADHAAR_TIMING_LOG", "1") not in ("", "0")
+
+PROFILE_LINES = 25
+
+LOGGER = logging.getLogger("aadhaar.timing")
+if not LOGGER.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    LOGGER.addHandler(_handler)
+    LOGGER.setLevel(logging.INFO)
+    LOGGER.propagate = False
+
+_local = threading.local()
+
+
+# ===============================
+# RERUN
+# ===============================
+class Rerun:
+    """Stage and call timings of one run of a page script."""
+
+    def __init__(self, page: str, profiler: str = PROFILER):
+        if profiler not in PROFILERS:
+            raise ValueError(f"unknown profiler {profiler!r}; expected {PROFILERS}")
+        if profiler == "pyinstrument" and pyinstrument is None:
+            raise RuntimeError("the pyinstrument profiler needs `pip install pyinstrument`")
+
+        self.page = page
+        self.stages: dict[str, float] = {}
+        self.calls: dict[str, list] = {}
+        self.profiler_name = profiler
+        self.profiler = None
+        self.profile_path: Path | None = None
+        self.profile_text = ""
+
+        if profiler == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif profiler == "pyinstrument":
+            self.profiler = pyinstrument.Profiler()
+            self.profiler.start()
+
+        self.started = self.last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self.last
+        self.last = now
+
+    def record(self, name: str, seconds: float) -> None:
+        count_total = self.calls.setdefault(name, [0, 0.0])
+        count_total[0] += 1
+        count_total[1] += seconds
+
+    def _stop_profiler(self) -> None:
+        if self.profiler is None:
+            return
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.page}-{datetime.now():%Y%m%d-%H%M%S-%f}"
+
+        if self.profiler_name == "cprofile":
+            self.profiler.disable()
+            self.profile_path = PROFILE_DIR / f"{stem}.prof"
+            self.profiler.dump_stats(self.profile_path)
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            self.profile_text = out.getvalue()
+        else:
+            self.profiler.stop()
+            self.profile_path = PROFILE_DIR / f"{stem}.html"
+            self.profile_path.write_text(self.profiler.output_html(), encoding="utf-8")
+            self.profile_text = self.profiler.output_text(unicode=True)
+        self.profiler = None
+
+    def finish(self, stage: str) -> dict:
+        """Close the last ``stage``, stop profiling and return the rerun's record."""
+        self.mark(stage)
+        self._stop_profiler()
+        return {
+            "event": "rerun",
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "page": self.page,
+            "total_ms": round((self.last - self.started) * 1000, 1),
+            "stages_ms": {k: round(v * 1000, 1) for k, v in self.stages.items()},
+            "calls": {
+                k: {"count": n, "ms": round(s * 1000, 1)} for k, (n, s) in self.calls.items()
+            },
+            "profile": str(self.profile_path) if self.profile_path else None,
+        }
+
+
+# ===============================
+# PAGE API
+# ===============================
+def current() -> Rerun | None:
+    return getattr(_local, "rerun", None)
+
+
+def start(page: str) -> Rerun:
+    """Begin timing a rerun of ``page`` in this thread."""
+    _local.rerun = Rerun(page)
+    return _local.rerun
+
+
+def mark(stage: str) -> None:
+    """Attribute the time since the previous mark to ``stage``."""
+    rerun = current()
+    if rerun is not None:
+        rerun.mark(stage)
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Record the enclosed block as a call of the active rerun, if any."""
+    rerun = current()
+    if rerun is None:
+        yield
+        return
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun.record(name, time.perf_counter() - begin)
+
+
+@contextlib.contextmanager
+def fragment(name: str):
+    """Time an ``st.fragment`` body.
+
+    Inside a full rerun it is recorded as the call ``fragment <name>``; when
+    Streamlit reruns only the fragment it is logged as a rerun of ``name``
+    (without the debug panel, as fragments cannot write to the sidebar).
+    """
+    if current() is not None:
+        with stage(f"fragment {name}"):
+            yield
+        return
+    start(name)
+    try:
+        yield
+    finally:
+        finish(debug=False)
+
+
+def finish(stage: str = "render", debug: bool | None = None) -> dict | None:
+    """End the rerun: log it and, in debug mode, show the sidebar panel.
+
+    The time since the last :func:`mark` is attributed to ``stage``.
+    """
+    rerun = current()
+    if rerun is None:
+        return None
+    _local.rerun = None
+    record = rerun.finish(stage)
+    if LOG:
+        LOGGER.info(json.dumps(record))
+
+    if debug is None:
+        debug = DEBUG or _debug_requested()
+    if debug:
+        panel(record, rerun.profile_text)
+    return record
+
+
+# ===============================
+# DEBUG PANEL
+# ===============================
+def _debug_requested() -> bool:
+    import streamlit as st
+
+    return st.query_params.get("debug", "0") not in ("", "0")
+
+
+def panel(record: dict, profile_text: str = "") -> None:
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander(f"⏱ Rerun {record['total_ms']:,.0f} ms", expanded=True):
+        stages = pd.DataFrame(
+            list(record["stages_ms"].items()), columns=["Stage", "ms"]
+        )
+        st.dataframe(stages, hide_index=True, use_container_width=True)
+
+        if record["calls"]:
+            calls = pd.DataFrame([
+                {"Call": name, "Count": c["count"], "ms": c["ms"]}
+                for name, c in record["calls"].items()
+            ]).sort_values("ms", ascending=False)
+            st.dataframe(calls, hide_index=True, use_container_width=True)
+
+        if profile_text:
+            st.caption(f"Profile saved to `{record['profile']}`")
+            st.code(profile_text, language=None)
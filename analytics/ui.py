@@ -0,0 +1,32 @@
+"""Streamlit widgets shared by several pages."""
+from __future__ import annotations
+
+import streamlit as st
+
+from analytics import report
+
+# Session key of the state chosen on the district pressure pages (05–06), so
+# switching between them keeps the selection
+PRESSURE_STATE = "pressure_state"
+
+
+def state_selector() -> str:
+    """Sidebar state picker for pages 05–06; returns the chosen state.
+
+    Defaults to the first state in the data and stops the page when there is
+    none.
+    """
+    state_options = report.states()
+
+    if not state_options:
+        st.warning("No state-level update data found in the datasets.")
+        st.stop()
+
+    current_state = st.session_state.get(PRESSURE_STATE, state_options[0])
+    state = st.sidebar.selectbox(
+        "State",
+        state_options,
+        index=state_options.index(current_state) if current_state in state_options else 0
+    )
+    st.session_state[PRESSURE_STATE] = state
+    return state
@@ -1,6 +1,6 @@
 import streamlit as st
-from pathlib import Path
-import base64
+
+from analytics import assets, timing
 
 # ===============================
 # PAGE CONFIG
@@ -10,12 +10,16 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("app")
+
 # ===============================
 # LOAD CSS
 # ===============================
-css = Path("styles/base.css").read_text(encoding="utf-8")
+css = assets.stylesheet("base.css")
 st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
+timing.mark("css")
+
 # ===============================
 # SIDEBAR TOP BRAND (SAFE)
 # ===============================
@@ -39,17 +43,14 @@ with st.sidebar:
     )
 
 # ===============================
-# IMAGE LOADER (STREAMLIT SAFE)
+# IMAGES (RESIZED, ENCODED ONCE PER PROCESS)
 # ===============================
-def img_to_base64(path):
-    with open(path, "rb") as img:
-        return base64.b64encode(img.read()).decode()
+img1 = assets.image_uri("story1.png")
+img2 = assets.image_uri("story2.png")
+img3 = assets.image_uri("story3.png")
+mbu_logo = assets.image_uri("mbulogo.png")
 
-# Load images (ALL BASE64)
-img1 = img_to_base64("assets/story1.png")
-img2 = img_to_base64("assets/story2.png")
-img3 = img_to_base64("assets/story3.png")
-mbu_logo = img_to_base64("assets/mbulogo.png")
+timing.mark("assets")
 
 # ===============================
 # MAIN CONTENT (UNCHANGED)
@@ -62,7 +63,7 @@ html = f"""
 <div class="info-grid">
 
   <div class="info-left">
-    <img src="data:image/png;base64,{mbu_logo}" class="college-logo">
+    <img src="{mbu_logo}" class="college-logo">
     <div class="info-strong">StartUrs</div>
     <div class="info-muted">Mohan Babu University</div>
   </div>
@@ -115,7 +116,7 @@ html = f"""
 
   <div class="story-box">
     <div class="story-img-wrap">
-      <img src="data:image/png;base64,{img1}" class="story-img">
+      <img src="{img1}" class="story-img">
       <div class="story-overlay">
         <h5>Rural Mobile Enrolment Surges</h5>
         <p>Field-driven updates & access expansion</p>
@@ -125,7 +126,7 @@ html = f"""
 
   <div class="story-box">
     <div class="story-img-wrap">
-      <img src="data:image/png;base64,{img2}" class="story-img">
+      <img src="{img2}" class="story-img">
       <div class="story-overlay">
         <h5>Urban Name Update Requests</h5>
         <p>Identity corrections & service compliance</p>
@@ -135,7 +136,7 @@ html = f"""
 
   <div class="story-box">
     <div class="story-img-wrap">
-      <img src="data:image/png;base64,{img3}" class="story-img">
+      <img src="{img3}" class="story-img">
       <div class="story-overlay">
         <h5>Age & Demographic Policy Pressure</h5>
         <p>Lifecycle-driven identity changes</p>
@@ -218,3 +219,5 @@ with st.sidebar:
 if st.button("»", key="next_page"):
     st.switch_page("pages/01_Data_Landscape.py")
 
+timing.finish()
+
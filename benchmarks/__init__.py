@@ -0,0 +1 @@
+"""Headless benchmarks for data loading and page computations."""
@@ -0,0 +1,148 @@
+"""Synthetic all-India pincode-day data for benchmarking.
+
+Writes per-state biometric and demographic drops with exactly the columns and
+formats of ``data/biometric_states/*.csv`` and ``data/Demographic_states/*.csv``
+into ``<root>/data/``, together with copies of the small national monthly
+files, so the merge scripts and every page pipeline can run against it
+unchanged.
+
+Row counts are a multiple (``--scale``) of the state drops currently under
+``data/``. States and their relative sizes come from ``state_population.csv``;
+districts, pincodes, days and counts are drawn at random from a fixed seed,
+so a given scale always produces the same files.
+
+    python -m benchmarks.generate --scale 10 --root benchmarks/.data/x10
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analytics.data import (
+    BIOMETRIC_COUNTS,
+    BIOMETRIC_STATES_DIR,
+    DATA_DIR,
+    DEMOGRAPHIC_COUNTS,
+    DEMOGRAPHIC_STATES_DIR,
+    ENROLMENT_FILE,
+    GENERATION_FILE,
+    POPULATION_FILE,
+    UPDATES_FILE,
+)
+
+SEED = 2025
+
+# Used when the real state drops are not present
+FALLBACK_ROWS = {"biometric": 100_000, "demographic": 40_000}
+
+DISTRICTS = 750
+PINCODES_PER_DISTRICT = 26
+FIRST_DAY = "2025-03-01"
+LAST_DAY = "2026-01-03"
+
+KINDS = {
+    "biometric": (BIOMETRIC_STATES_DIR, BIOMETRIC_COUNTS, 180.0),
+    "demographic": (DEMOGRAPHIC_STATES_DIR, DEMOGRAPHIC_COUNTS, 90.0),
+}
+
+
+def base_rows(kind: str) -> int:
+    """Data rows in the current state drops of ``kind``."""
+    folder = KINDS[kind][0]
+    rows = 0
+    for path in folder.glob("*.csv"):
+        with open(path, "rb") as f:
+            rows += sum(1 for _ in f) - 1
+    return rows or FALLBACK_ROWS[kind]
+
+
+def geography(rng: np.random.Generator) -> pd.DataFrame:
+    """One row per pincode: ``state``, ``district``, ``pincode``, ``weight``."""
+    population = pd.read_csv(POPULATION_FILE)
+    share = population["Population_2024"] / population["Population_2024"].sum()
+    per_state = np.maximum(2, np.round(share * DISTRICTS)).astype(int)
+
+    rows = []
+    for state, n_districts, state_share in zip(
+        population["State_Union_Territory"], per_state, share
+    ):
+        for d in range(n_districts):
+            pins = rng.integers(PINCODES_PER_DISTRICT // 2, PINCODES_PER_DISTRICT * 2)
+            rows.append((state, f"{state} District {d + 1}", pins, state_share / n_districts))
+
+    frame = pd.DataFrame(rows, columns=["state", "district", "pincodes", "weight"])
+    frame = frame.loc[frame.index.repeat(frame["pincodes"])].reset_index(drop=True)
+    frame["weight"] /= frame.groupby("district")["pincodes"].transform("size")
+    frame["weight"] *= rng.lognormal(0, 0.75, len(frame))
+    frame["weight"] /= frame["weight"].sum()
+    frame["pincode"] = rng.choice(np.arange(110_001, 855_118), len(frame), replace=False)
+    return frame[["state", "district", "pincode", "weight"]]
+
+
+def generate_kind(kind: str, scale: float, places: pd.DataFrame,
+                  out_dir: Path, rng: np.random.Generator) -> int:
+    folder, counts, mean_count = KINDS[kind]
+    rows = int(base_rows(kind) * scale)
+
+    days = pd.date_range(FIRST_DAY, LAST_DAY, freq="D")
+    place = rng.choice(len(places), rows, p=places["weight"].to_numpy())
+    day = np.sort(rng.integers(0, len(days), rows))
+
+    codes, uniques = pd.factorize(days[day])
+    df = pd.DataFrame({
+        "date": uniques.strftime("%d-%m-%Y").take(codes),
+        "state": places["state"].to_numpy()[place],
+        "district": places["district"].to_numpy()[place],
+        "pincode": places["pincode"].to_numpy()[place],
+    })
+    for col in counts:
+        df[col] = rng.poisson(rng.gamma(1.2, mean_count / 1.2 / len(counts), rows))
+
+    out = out_dir / folder.name
+    out.mkdir(parents=True, exist_ok=True)
+    for state, part in df.groupby("state", sort=False):
+        name = re.sub(r"\W+", "_", state.lower()).strip("_")
+        part.to_csv(out / f"{name}.csv", index=False)
+    return rows
+
+
+def generate(scale: float, root: str | Path) -> dict[str, int]:
+    """Write a synthetic ``data/`` tree under ``root``; return rows per kind."""
+    data = Path(root) / DATA_DIR
+    if data.exists():
+        shutil.rmtree(data)
+    data.mkdir(parents=True)
+
+    for path in (GENERATION_FILE, UPDATES_FILE, ENROLMENT_FILE, POPULATION_FILE):
+        shutil.copy(path, data / path.name)
+
+    rng = np.random.default_rng(SEED)
+    places = geography(rng)
+    return {kind: generate_kind(kind, scale, places, data, rng) for kind in KINDS}
+
+
+def default_root(scale: float) -> Path:
+    return Path("benchmarks/.data") / f"x{scale:g}"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic state drops.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiple of the current state drops' rows (default 1)")
+    parser.add_argument("--root", default=None,
+                        help="output root (default benchmarks/.data/x<scale>)")
+    args = parser.parse_args(argv)
+
+    root = args.root or default_root(args.scale)
+    for kind, rows in generate(args.scale, root).items():
+        print(f"{kind}: {rows} rows")
+    print("Saved:", Path(root) / DATA_DIR)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""Time the data pipeline headlessly against a synthetic data tree.
+
+Generates (or reuses) a synthetic ``data/`` tree at the requested scale (see
+:mod:`benchmarks.generate`), then times, with every cache cleared before each
+repeat:
+
+- ``merge``: the merge scripts' CSV and Parquet outputs and the shared-file
+  publish
+- ``hot``: the raw hot paths on the merged CSV (CSV read, date parsing, the
+  age-band row sum, the district groupby, the district merge and chart
+  downsampling of a row-level series)
+- ``page``: each page's data pipeline, exactly as the pages call it but
+  without Streamlit
+
+Results are written as JSON (one record per benchmark with the minimum and
+median of the repeats, plus the scale, row counts and library versions).
+``--compare`` diffs the run against an earlier result file and exits non-zero
+when a benchmark got slower than ``--tolerance``.
+
+    python -m benchmarks.run --scale 10 --compare benchmarks/results/base.json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from analytics import disk_cache
+from analytics.cube import KINDS, states
+from analytics.data import (
+    BIOMETRIC_FILE,
+    BIOMETRIC_STATES_DIR,
+    DEMOGRAPHIC_FILE,
+    DEMOGRAPHIC_STATES_DIR,
+    clear_cache,
+)
+from analytics.dates import parse_dates
+from analytics.downsample import downsample
+from analytics.merge import merge_csv, merge_parquet
+from analytics.pincode import top_pincodes
+from analytics.pipelines import (
+    SURGE_STATE,
+    aadhaar_growth,
+    concentration_curve,
+    district_forecasts,
+    district_leaderboard,
+    monthly_updates,
+    national_forecast,
+    state_concentration,
+    state_monthly,
+    state_per_capita,
+    state_seasonality,
+    state_volatility,
+    update_dominance,
+    update_surges,
+    update_types_daily,
+)
+from analytics.shared import publish
+from benchmarks.generate import default_root, generate
+
+RESULTS_DIR = Path("benchmarks/results")
+
+DEFAULT_REPEATS = 3
+DEFAULT_TOLERANCE = 1.25
+
+
+# ===============================
+# TIMING
+# ===============================
+def cold() -> None:
+    """Forget every cached frame so the next call recomputes from files."""
+    clear_cache()
+    disk_cache.clear()
+
+
+def measure(func, repeats: int, setup=cold) -> dict:
+    times = []
+    for _ in range(repeats):
+        setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "repeats": repeats,
+    }
+
+
+@contextlib.contextmanager
+def working_directory(path: Path):
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+# ===============================
+# BENCHMARKS
+# ===============================
+STATE_DIRS = {
+    "biometric": BIOMETRIC_STATES_DIR,
+    "demographic": DEMOGRAPHIC_STATES_DIR,
+}
+
+
+def _merge(func, kind, output) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(STATE_DIRS[kind], output, KINDS[kind]["cube"], kind, full=True)
+
+
+def prepare() -> None:
+    """Merge the synthetic drops once if no merged output exists yet."""
+    for kind, spec in KINDS.items():
+        if not spec["file"].exists():
+            _merge(merge_csv, kind, spec["file"])
+
+
+def merge_benchmarks() -> dict:
+    benchmarks = {}
+    for kind, spec in KINDS.items():
+        benchmarks[f"merge_csv_{kind}"] = (
+            lambda kind=kind, spec=spec: _merge(merge_csv, kind, spec["file"])
+        )
+        benchmarks[f"merge_parquet_{kind}"] = (
+            lambda kind=kind, spec=spec: _merge(merge_parquet, kind, spec["store"])
+        )
+    benchmarks["publish_shared"] = lambda: [
+        publish(spec["load"](), spec["shared"]) for spec in KINDS.values()
+    ]
+    return benchmarks
+
+
+def hot_benchmarks() -> dict:
+    bio = pd.read_csv(BIOMETRIC_FILE)
+    demo = pd.read_csv(DEMOGRAPHIC_FILE)
+    counts = KINDS["biometric"]["counts"]
+
+    def district_totals(df):
+        cols = [c for c in df.columns if "_age_" in c]
+        return df.groupby(["state", "district"], as_index=False)[cols].sum()
+
+    bio_d, demo_d = district_totals(bio), district_totals(demo)
+
+    series = pd.DataFrame({
+        "date": parse_dates(bio["date"]),
+        "count": bio[counts].sum(axis=1),
+    }).sort_values("date", kind="stable")
+
+    return {
+        "read_csv": lambda: pd.read_csv(BIOMETRIC_FILE),
+        "parse_dates_inferred": lambda: pd.to_datetime(
+            bio["date"], errors="coerce", dayfirst=True),
+        "parse_dates_fast_path": lambda: parse_dates(bio["date"]),
+        "age_band_row_sum": lambda: bio[counts].sum(axis=1),
+        "district_groupby": lambda: district_totals(bio),
+        "district_merge": lambda: pd.merge(
+            bio_d, demo_d, on=["state", "district"], how="outer"),
+        "downsample_lttb": lambda: downsample(series, "date", ["count"], method="lttb"),
+        "downsample_minmax": lambda: downsample(series, "date", ["count"], method="minmax"),
+    }
+
+
+def page_benchmarks() -> dict:
+    state = states()[0]
+    district = district_leaderboard(state)["district"].iloc[0]
+
+    def surges():
+        SURGE_STATE.unlink(missing_ok=True)
+        update_surges()
+
+    return {
+        "page01_aadhaar_growth": aadhaar_growth,
+        "page02_monthly_updates": monthly_updates,
+        "page02_state_monthly": state_monthly,
+        "page02_state_seasonality": state_seasonality,
+        "page02_state_volatility": state_volatility,
+        "page03_update_dominance": update_dominance,
+        "page04_update_types_daily": update_types_daily,
+        "page05_district_leaderboard": lambda: district_leaderboard(state),
+        "page05_top_pincodes": lambda: top_pincodes(state, district),
+        "page05_surge_alerts": surges,
+        "page06_concentration_curve": lambda: concentration_curve(state),
+        "page06_state_concentration": state_concentration,
+        "page06_state_per_capita": state_per_capita,
+        "page07_national_forecast": national_forecast,
+        "page07_district_forecasts": district_forecasts,
+    }
+
+
+GROUPS = {
+    "merge": merge_benchmarks,
+    "hot": hot_benchmarks,
+    "page": page_benchmarks,
+}
+
+
+# ===============================
+# RESULTS
+# ===============================
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(scale: float, root: Path, repeats: int, groups, regenerate=False) -> dict:
+    if regenerate or not (root / "data").is_dir():
+        rows = generate(scale, root)
+    else:
+        rows = {}
+
+    meta = {
+        "scale": scale,
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "pyarrow": pa.__version__,
+        "cpus": os.cpu_count(),
+    }
+
+    results = []
+    with working_directory(root):
+        prepare()
+        for group in groups:
+            for name, func in GROUPS[group]().items():
+                timing = measure(func, repeats)
+                results.append({"group": group, "name": name, **timing})
+                print(f"{group:>5}  {name:<30} {timing['min_s'] * 1000:10.1f} ms")
+        for kind, spec in KINDS.items():
+            rows.setdefault(kind, len(spec["load"](columns=["pincode"])))
+
+    meta["rows"] = rows
+    return {"meta": meta, "results": results}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> bool:
+    """Print min-time ratios against ``baseline``; False if any exceeds ``tolerance``."""
+    before = {(r["group"], r["name"]): r["min_s"] for r in baseline["results"]}
+    ok = True
+    print(f"\nvs baseline (scale {baseline['meta'].get('scale')}, "
+          f"commit {baseline['meta'].get('commit')}):")
+    for r in current["results"]:
+        old = before.get((r["group"], r["name"]))
+        if old is None:
+            continue
+        ratio = r["min_s"] / old if old else float("inf")
+        slower = ratio > tolerance
+        ok &= not slower
+        flag = "  SLOWER" if slower else ""
+        print(f"{r['group']:>5}  {r['name']:<30} {ratio:6.2f}x{flag}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark data loading and page pipelines.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="synthetic data size as a multiple of current rows (default 1)")
+    parser.add_argument("--root", type=Path, default=None,
+                        help="synthetic data root (default benchmarks/.data/x<scale>)")
+    parser.add_argument("--regenerate", action="store_true",
+                        help="regenerate the synthetic data even if it exists")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help=f"timed runs per benchmark (default {DEFAULT_REPEATS})")
+    parser.add_argument("--only", choices=list(GROUPS), action="append",
+                        help="run only this group (repeatable)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="result file (default benchmarks/results/<time>-x<scale>.json)")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"slowdown ratio that fails --compare (default {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    root = (args.root or default_root(args.scale)).resolve()
+    groups = args.only or list(GROUPS)
+    result = run(args.scale, root, args.repeats, groups, args.regenerate)
+
+    output = args.output or RESULTS_DIR / (
+        f"{datetime.now():%Y%m%d-%H%M%S}-x{args.scale:g}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    print("Saved:", output)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if not compare(result, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
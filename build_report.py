@@ -0,0 +1,4 @@
+from analytics.report import main
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,15 @@
-import pandas as pd
-import glob
-
-INPUT_FOLDER = "data/biometric_states"
-OUTPUT_FILE = "data/biometric_sampled_india.csv"
-
-files = glob.glob(f"{INPUT_FOLDER}/*.csv")
-
-dfs = []
-for file in files:
-    df = pd.read_csv(file)
-    dfs.append(df)
-
-merged_df = pd.concat(dfs, ignore_index=True)
-merged_df.to_csv(OUTPUT_FILE, index=False)
-
-print("Merged biometric data rows:", len(merged_df))
-print("Saved:", OUTPUT_FILE)
+from analytics.data import (
+    BIOMETRIC_CUBE,
+    BIOMETRIC_FILE,
+    BIOMETRIC_STATES_DIR,
+    BIOMETRIC_STORE,
+)
+from analytics.merge import run
+
+INPUT_FOLDER = BIOMETRIC_STATES_DIR
+OUTPUT_FILE = BIOMETRIC_FILE
+STORE_DIR = BIOMETRIC_STORE
+CUBE_DIR = BIOMETRIC_CUBE
+
+if __name__ == "__main__":
+    run("biometric", INPUT_FOLDER, OUTPUT_FILE, STORE_DIR, CUBE_DIR)
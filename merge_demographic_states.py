@@ -1,18 +1,15 @@
-import pandas as pd
-import glob
-
-INPUT_FOLDER = "data/Demographic_states"
-OUTPUT_FILE = "data/demographic_sampled_india.csv"
-
-files = glob.glob(f"{INPUT_FOLDER}/*.csv")
-
-dfs = []
-for file in files:
-    df = pd.read_csv(file)
-    dfs.append(df)
-
-merged_df = pd.concat(dfs, ignore_index=True)
-merged_df.to_csv(OUTPUT_FILE, index=False)
-
-print("Merged demographic data rows:", len(merged_df))
-print("Saved:", OUTPUT_FILE)
+from analytics.data import (
+    DEMOGRAPHIC_CUBE,
+    DEMOGRAPHIC_FILE,
+    DEMOGRAPHIC_STATES_DIR,
+    DEMOGRAPHIC_STORE,
+)
+from analytics.merge import run
+
+INPUT_FOLDER = DEMOGRAPHIC_STATES_DIR
+OUTPUT_FILE = DEMOGRAPHIC_FILE
+STORE_DIR = DEMOGRAPHIC_STORE
+CUBE_DIR = DEMOGRAPHIC_CUBE
+
+if __name__ == "__main__":
+    run("demographic", INPUT_FOLDER, OUTPUT_FILE, STORE_DIR, CUBE_DIR)
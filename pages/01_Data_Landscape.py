@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
+
+from analytics import assets, report, timing
 
 # ===============================
 # PAGE CONFIG
@@ -10,28 +10,24 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("01_Data_Landscape")
+
 # ===============================
 # LOAD CSS
 # ===============================
-base_css = Path("styles/base.css").read_text(encoding="utf-8")
-page_css = Path("styles/page.css").read_text(encoding="utf-8")
+css = assets.stylesheet("base.css", "page.css")
+
+st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
-st.markdown(f"<style>{page_css}</style>", unsafe_allow_html=True)
+timing.mark("css")
 
 # ===============================
 # LOAD DATA
 # ===============================
-data_path = Path("data")
+aadhaar_gen = report.table("aadhaar_growth")
+coverage = report.metrics("coverage_metrics")
 
-aadhaar_gen = pd.read_csv(data_path / "aa_generation_all_states_monthly.csv")
-population = pd.read_csv(data_path / "state_population.csv")
-
-aadhaar_gen["req_month"] = pd.to_datetime(aadhaar_gen["req_month"])
-
-latest_total_aadhaar = aadhaar_gen["cumulative"].iloc[-1]
-total_population = population["Population_2024"].sum()
-coverage_pct = (latest_total_aadhaar / total_population) * 100
+timing.mark("load")
 
 # ===============================
 # MAIN CONTENT
@@ -59,17 +55,17 @@ html = f"""
 
   <div class="metric-card">
     <h4>Total Aadhaar Generated</h4>
-    <p>{latest_total_aadhaar:,}</p>
+    <p>{coverage['Total_Generated']:,}</p>
   </div>
 
   <div class="metric-card">
     <h4>India Population (2024)</h4>
-    <p>{total_population:,}</p>
+    <p>{coverage['Population']:,}</p>
   </div>
 
   <div class="metric-card">
     <h4>Coverage Level</h4>
-    <p>{coverage_pct:.2f}%</p>
+    <p>{coverage['Coverage_Pct']:.2f}%</p>
   </div>
 
 </div>
@@ -114,5 +110,7 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/02_Temporal_Behaviour.py")
\ No newline at end of file
@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-import plotly.express as px
+
+from analytics import assets, figures, report, timing
 
 # ===============================
 # PAGE CONFIG
@@ -11,24 +10,16 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("02_Temporal_Behaviour")
+
 # ===============================
 # LOAD CSS
 # ===============================
-base_css = Path("styles/base.css").read_text(encoding="utf-8")
-page_css = Path("styles/page.css").read_text(encoding="utf-8")
-
-st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
-st.markdown(f"<style>{page_css}</style>", unsafe_allow_html=True)
+css = assets.stylesheet("base.css", "page.css")
 
-# ===============================
-# LOAD DATA
-# ===============================
-data_path = Path("data")
-updates = pd.read_csv(data_path / "aa_updates_all_states_monthly.csv")
+st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-updates["Month-Year"] = pd.to_datetime(updates["Month-Year"])
-updates = updates.sort_values("Month-Year")
-updates["MoM Change"] = updates["Value"].diff()
+timing.mark("css")
 
 # ===============================
 # PAGE HEADER (FIXED)
@@ -66,23 +57,10 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-fig_trend = px.area(
-    updates,
-    x="Month-Year",
-    y="Value",
-    labels={
-        "Month-Year": "Month",
-        "Value": "Number of Updates"
-    }
-)
-
-fig_trend.update_layout(
-    height=420,
-    showlegend=False,
-    margin=dict(l=20, r=20, t=20, b=20)
-)
+fig_trend = report.figure("update_trend")
 
-st.plotly_chart(fig_trend, use_container_width=True)
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig_trend, use_container_width=True)
 
 st.caption(
     "Update activity persists every month, indicating Aadhaar functions as an ongoing operational system rather than a completed enrolment exercise."
@@ -103,23 +81,10 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-fig_mom = px.bar(
-    updates,
-    x="Month-Year",
-    y="MoM Change",
-    labels={
-        "Month-Year": "Month",
-        "MoM Change": "Change from Previous Month"
-    }
-)
-
-fig_mom.update_layout(
-    height=380,
-    showlegend=False,
-    margin=dict(l=20, r=20, t=20, b=20)
-)
+fig_mom = report.figure("update_change")
 
-st.plotly_chart(fig_mom, use_container_width=True)
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig_mom, use_container_width=True)
 
 st.caption(
     "Fluctuations suggest update volumes respond to policy changes, compliance cycles, or service enforcement."
@@ -127,6 +92,111 @@ st.caption(
 
 st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 
+# ===============================
+# SECTION 3 — STATE RHYTHMS (STATE x DAY CALENDAR MATRIX)
+# ===============================
+st.markdown(
+    """
+    <div class="section-title">How Update Rhythms Differ Across States</div>
+    <div class="section-subtitle">
+        Monthly load, weekly and seasonal profiles and volatility of every state,
+        from the daily pincode-level update tables
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+# Empty until the state folders have been merged
+volatility = report.table("state_volatility")
+
+timing.mark("load")
+
+
+# Fragment: changing the compared states reruns only this chart
+@st.fragment
+def state_comparison(monthly, ranked):
+    with timing.fragment("02_Temporal_Behaviour/states"):
+        chosen = st.multiselect(
+            "Compare states",
+            ranked,
+            default=ranked[:5]
+        )
+
+        if not chosen:
+            st.info("Pick at least one state to compare.")
+            return
+
+        fig_states = figures.state_monthly(monthly, chosen)
+
+        with timing.stage("plotly_chart"):
+            st.plotly_chart(fig_states, use_container_width=True)
+
+
+if not volatility.empty:
+    rhythm = report.metrics("rhythm_metrics")
+
+    c1, c2, c3 = st.columns(3)
+
+    with c1:
+        st.metric("States Compared", rhythm["States"])
+
+    with c2:
+        st.metric("Most Volatile Daily Load", rhythm["Most_Volatile"] or "—")
+
+    with c3:
+        st.metric("Most Common Peak Weekday", rhythm["Common_Peak_Weekday"] or "—")
+
+    monthly = report.table("state_monthly")
+    busiest = volatility.sort_values("Daily_Mean", ascending=False)["state"].tolist()
+    state_comparison(monthly, busiest)
+
+    st.caption(
+        "Months reported on fewer than half their days are left out; the rest are scaled to the full month. "
+        "Hover for month-over-month and year-over-year change."
+    )
+
+    col_week, col_month = st.columns(2)
+
+    with col_week:
+        st.markdown('<div class="section-subtitle">Day-of-week profile (100 = the state\'s average day)</div>',
+                    unsafe_allow_html=True)
+        with timing.stage("plotly_chart"):
+            st.plotly_chart(report.figure("weekday_rhythm"), use_container_width=True)
+
+    with col_month:
+        st.markdown('<div class="section-subtitle">Month-of-year profile (100 = the state\'s average day)</div>',
+                    unsafe_allow_html=True)
+        with timing.stage("plotly_chart"):
+            st.plotly_chart(report.figure("month_rhythm"), use_container_width=True)
+
+    st.markdown('<div class="section-subtitle">Volatility of daily update load by state</div>',
+                unsafe_allow_html=True)
+
+    with timing.stage("plotly_chart"):
+        st.plotly_chart(report.figure("volatility_ranking"), use_container_width=True)
+
+    with st.expander("Rhythm summary by state"):
+        st.dataframe(
+            volatility,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "state": "State",
+                "Daily_Mean": st.column_config.NumberColumn("Updates / Day", format="%.0f"),
+                "Daily_CV": st.column_config.NumberColumn("Daily CV", format="%.2f"),
+                "MoM_Volatility": st.column_config.NumberColumn("MoM Spread (pp)", format="%.1f"),
+                "Last_Month": "Latest Month",
+                "Last_MoM_Pct": st.column_config.NumberColumn("MoM %", format="%+.1f%%"),
+                "Last_YoY_Pct": st.column_config.NumberColumn("YoY %", format="%+.1f%%"),
+                "Peak_Weekday": "Peak Weekday",
+                "Peak_Month": "Peak Month",
+            },
+        )
+else:
+    st.info("No state-level daily update data found in the datasets.")
+
+st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
+
 # ===============================
 # KEY INSIGHT
 # ===============================
@@ -157,5 +227,7 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/03_Update_Dominance.py")
\ No newline at end of file
@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-import plotly.express as px
+
+from analytics import assets, report, timing
 
 # ===============================
 # PAGE CONFIG
@@ -11,14 +10,16 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("03_Update_Dominance")
+
 # ===============================
 # LOAD CSS
 # ===============================
-base_css = Path("styles/base.css").read_text(encoding="utf-8")
-section_css = Path("styles/section2.css").read_text(encoding="utf-8")
+css = assets.stylesheet("base.css", "section2.css")
+
+st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>", unsafe_allow_html=True)
+timing.mark("css")
 
 # ===============================
 # PAGE HEADER (SECTION2 STYLE)
@@ -37,47 +38,11 @@ to quantify system pressure after enrolment saturation.
 st.divider()
 
 # ===============================
-# LOAD DATA
-# ===============================
-data_path = Path("data")
-
-updates_df = pd.read_csv(data_path / "aa_updates_all_states_monthly.csv")
-enrol_df = pd.read_csv(data_path / "AllStates_MonthWise (2).csv")
-
-# ===============================
-# PARSE DATES (ROBUST & SAFE)
+# LOAD METRICS (PRECOMPUTED REPORT OR DISK-CACHED)
 # ===============================
-updates_df["Month"] = pd.to_datetime(
-    updates_df["Month-Year"],
-    errors="coerce"
-)
-
-enrol_df["Month"] = pd.to_datetime(
-    enrol_df["Period"],
-    errors="coerce"
-)
+metrics = report.metrics("dominance_metrics")
 
-updates_df = updates_df.dropna(subset=["Month"])
-enrol_df = enrol_df.dropna(subset=["Month"])
-
-# ===============================
-# STANDARDIZE COLUMNS
-# ===============================
-updates_df = updates_df.rename(columns={"Value": "Updates"})
-enrol_df = enrol_df.rename(columns={"Month Values": "Enrolments"})
-
-# ===============================
-# MERGE DATA
-# ===============================
-df = pd.merge(
-    enrol_df[["Month", "Enrolments"]],
-    updates_df[["Month", "Updates"]],
-    on="Month",
-    how="inner"
-)
-
-df = df.sort_values("Month")
-df["Update_to_Enrolment_Ratio"] = df["Updates"] / df["Enrolments"]
+timing.mark("load")
 
 # ===============================
 # METRICS
@@ -87,15 +52,15 @@ st.markdown('<div class="section-metrics">', unsafe_allow_html=True)
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("Avg Monthly Enrolments", f"{int(df['Enrolments'].mean()):,}")
+    st.metric("Avg Monthly Enrolments", f"{int(metrics['Avg_Enrolments']):,}")
 
 with col2:
-    st.metric("Avg Monthly Updates", f"{int(df['Updates'].mean()):,}")
+    st.metric("Avg Monthly Updates", f"{int(metrics['Avg_Updates']):,}")
 
 with col3:
     st.metric(
         "Update / Enrolment Ratio",
-        f"{df['Update_to_Enrolment_Ratio'].mean():.1f}×"
+        f"{metrics['Avg_Ratio']:.1f}×"
     )
 
 st.markdown('</div>', unsafe_allow_html=True)
@@ -112,15 +77,9 @@ Update volumes consistently outweigh new Aadhaar creation
 </div>
 """, unsafe_allow_html=True)
 
-fig1 = px.line(
-    df,
-    x="Month",
-    y=["Enrolments", "Updates"],
-    labels={"value": "Count", "variable": "Activity Type"}
-)
-
-fig1.update_layout(legend_title_text="", height=420)
-st.plotly_chart(fig1, use_container_width=True)
+fig1 = report.figure("enrolments_vs_updates")
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig1, use_container_width=True)
 
 # ===============================
 # CHART 2 — UPDATE DOMINANCE RATIO
@@ -132,15 +91,9 @@ Number of updates processed for every new Aadhaar enrolment
 </div>
 """, unsafe_allow_html=True)
 
-fig2 = px.bar(
-    df,
-    x="Month",
-    y="Update_to_Enrolment_Ratio",
-    labels={"Update_to_Enrolment_Ratio": "Updates per Enrolment"}
-)
-
-fig2.update_layout(height=380)
-st.plotly_chart(fig2, use_container_width=True)
+fig2 = report.figure("dominance_ratio")
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig2, use_container_width=True)
 
 # ===============================
 # INSIGHT BOX
@@ -167,6 +120,8 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+timing.finish()
+
 # ===============================
 # 🔥 FLOATING FORWARD BUTTON (ADDED)
 # ===============================
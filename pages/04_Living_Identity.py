@@ -1,7 +1,8 @@
-import streamlit as st
 import pandas as pd
-from pathlib import Path
-import plotly.express as px
+import streamlit as st
+
+from analytics import assets, figures, report, timing
+from analytics.data import BIOMETRIC_COUNTS, DEMOGRAPHIC_COUNTS
 
 # ===============================
 # PAGE CONFIG
@@ -11,14 +12,16 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("04_Living_Identity")
+
 # ===============================
 # LOAD CSS
 # ===============================
-base_css = Path("styles/base.css").read_text(encoding="utf-8")
-section_css = Path("styles/section2.css").read_text(encoding="utf-8")
+css = assets.stylesheet("base.css", "section2.css")
+
+st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>", unsafe_allow_html=True)
+timing.mark("css")
 
 # ===============================
 # PAGE HEADER
@@ -37,39 +40,19 @@ because identity evolves with human life.
 st.divider()
 
 # ===============================
-# LOAD DATA  ✅ (UPDATED TO FINAL DATASETS)
-# ===============================
-data_path = Path("data")
-
-bio = pd.read_csv(data_path / "biometric_sampled_india.csv")
-demo = pd.read_csv(data_path / "demographic_sampled_india.csv")
-
-# ===============================
-# DATE PARSING (SAFE)
-# ===============================
-bio["date"] = pd.to_datetime(bio["date"], errors="coerce", dayfirst=True)
-demo["date"] = pd.to_datetime(demo["date"], errors="coerce", dayfirst=True)
-
-bio = bio.dropna(subset=["date"])
-demo = demo.dropna(subset=["date"])
-
-# ===============================
-# AUTO COLUMN DETECTION
+# LOAD DATA  ✅ (PRE-AGGREGATED ROLLUP CUBE)
 # ===============================
-bio_cols = [c for c in bio.columns if c.startswith("bio_age")]
-demo_cols = [c for c in demo.columns if c.startswith("demo_age")]
+bio_cols = BIOMETRIC_COUNTS
+demo_cols = DEMOGRAPHIC_COUNTS
 
-# ===============================
-# AGGREGATION (NO HARD CODING)
-# ===============================
-bio["Biometric_Updates"] = bio[bio_cols].sum(axis=1)
-demo["Demographic_Updates"] = demo[demo_cols].sum(axis=1)
+# Daily totals across all age bands, summed at merge time
+metrics = report.metrics("update_type_metrics")
 
-bio_monthly = bio.groupby("date", as_index=False)["Biometric_Updates"].sum()
-demo_monthly = demo.groupby("date", as_index=False)["Demographic_Updates"].sum()
+timing.mark("load")
 
-df = pd.merge(bio_monthly, demo_monthly, on="date", how="inner")
-df = df.sort_values("date")
+if metrics["Dominant"] is None:
+    st.warning("No days with both biometric and demographic updates found in the datasets.")
+    st.stop()
 
 # ===============================
 # METRICS
@@ -81,22 +64,17 @@ col1, col2, col3 = st.columns(3)
 with col1:
     st.metric(
         "Avg Monthly Biometric Updates",
-        f"{int(df['Biometric_Updates'].mean()):,}"
+        f"{int(metrics['Avg_Biometric']):,}"
     )
 
 with col2:
     st.metric(
         "Avg Monthly Demographic Updates",
-        f"{int(df['Demographic_Updates'].mean()):,}"
+        f"{int(metrics['Avg_Demographic']):,}"
     )
 
 with col3:
-    dominant = (
-        "Biometric"
-        if df["Biometric_Updates"].mean() > df["Demographic_Updates"].mean()
-        else "Demographic"
-    )
-    st.metric("Dominant Update Type", dominant)
+    st.metric("Dominant Update Type", metrics["Dominant"])
 
 # ✅ SCOPE MICRO-CLARIFICATION (NEW)
 st.markdown("""
@@ -142,25 +120,37 @@ Life-driven identity updates observed consistently across states
 """, unsafe_allow_html=True)
 
 # ===============================
-# CHART
+# CHART (FRAGMENT: ZOOMING RERUNS ONLY THE CHART)
 # ===============================
-fig = px.line(
-    df,
-    x="date",
-    y=["Biometric_Updates", "Demographic_Updates"],
-    labels={
-        "value": "Number of Updates",
-        "variable": "Update Type",
-        "date": "Month"
-    }
-)
+# Zooming re-samples the daily series for the chosen window, so detail hidden
+# at full range comes back; the full range uses the precomputed figure.
+@st.fragment
+def update_types_chart():
+    with timing.fragment("04_Living_Identity/update_types"):
+        daily = report.table("update_types_daily")
+        first, last = daily["date"].min().date(), daily["date"].max().date()
 
-fig.update_layout(
-    legend_title_text="",
-    height=420
-)
+        if first < last:
+            window = st.slider(
+                "Zoom to dates",
+                min_value=first,
+                max_value=last,
+                value=(first, last),
+                format="DD MMM YYYY"
+            )
+        else:
+            window = (first, last)
+
+        if window == (first, last):
+            fig = report.figure("update_types")
+        else:
+            fig = figures.update_types(daily, x_range=tuple(pd.Timestamp(d) for d in window))
+
+        with timing.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
 
-st.plotly_chart(fig, use_container_width=True)
+
+update_types_chart()
 
 # ===============================
 # DATA COVERAGE NOTE (CRITICAL)
@@ -199,5 +189,7 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/05_District_Pressure_AP.py")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-import plotly.express as px
+
+from analytics import assets, figures, report, timing, ui
+from analytics.pincode import top_pincodes
 
 # ===============================
 # PAGE CONFIG
@@ -11,21 +11,28 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("05_District_Pressure_AP")
+
 # ===============================
 # LOAD CSS
 # ===============================
-base_css = Path("styles/base.css").read_text(encoding="utf-8")
-section_css = Path("styles/section3.css").read_text(encoding="utf-8")
+css = assets.stylesheet("base.css", "section3.css")
+
+st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>", unsafe_allow_html=True)
+timing.mark("css")
+
+# ===============================
+# STATE SELECTOR (SHARED BY PAGES 05–06)
+# ===============================
+state = ui.state_selector()
 
 # ===============================
 # PAGE HEADER
 # ===============================
-st.markdown("""
+st.markdown(f"""
 <div class="section-title-main">
-📍 District Pressure — Andhra Pradesh
+📍 District Pressure — {state}
 </div>
 
 <div class="section-subtitle">
@@ -36,99 +43,76 @@ Where Aadhaar update load concentrates geographically and why it matters for gov
 st.divider()
 
 # ===============================
-# LOAD DATA
-# ===============================
-data_path = Path("data")
-
-bio = pd.read_csv(data_path / "biometric_sampled_india.csv")
-demo = pd.read_csv(data_path / "demographic_sampled_india.csv")
-
-# ===============================
-# BASIC VALIDATION
-# ===============================
-required_cols = {"state", "district"}
-
-if not required_cols.issubset(bio.columns) or not required_cols.issubset(demo.columns):
-    st.error("Required columns (state, district) missing in dataset.")
-    st.stop()
-
-# ===============================
-# FILTER ANDHRA PRADESH
+# DISTRICT LEADERBOARD (PRECOMPUTED REPORT OR ROLLUP CUBE)
 # ===============================
-bio = bio[bio["state"] == "Andhra Pradesh"]
-demo = demo[demo["state"] == "Andhra Pradesh"]
-
-if bio.empty and demo.empty:
-    st.warning("No Andhra Pradesh data found in the datasets.")
-    st.stop()
+df = report.table("district_leaderboard", state)
 
-# ===============================
-# AUTO COLUMN DETECTION
-# ===============================
-bio_cols = [c for c in bio.columns if c.startswith("bio_age")]
-demo_cols = [c for c in demo.columns if c.startswith("demo_age")]
+timing.mark("load")
 
-if not bio_cols or not demo_cols:
-    st.error("Age-wise update columns not found.")
+if df.empty:
+    st.warning(f"No {state} data found in the datasets.")
     st.stop()
 
-bio["Biometric_Updates"] = bio[bio_cols].sum(axis=1)
-demo["Demographic_Updates"] = demo[demo_cols].sum(axis=1)
-
-# ===============================
-# AGGREGATE BY DISTRICT
-# ===============================
-bio_dist = (
-    bio.groupby("district", as_index=False)["Biometric_Updates"]
-    .sum()
-)
-
-demo_dist = (
-    demo.groupby("district", as_index=False)["Demographic_Updates"]
-    .sum()
-)
-
-df = (
-    pd.merge(bio_dist, demo_dist, on="district", how="outer")
-    .fillna(0)
-)
-
-df["Total_Updates"] = df["Biometric_Updates"] + df["Demographic_Updates"]
-df = df.sort_values("Total_Updates", ascending=False).reset_index(drop=True)
-
 # ===============================
 # METRICS
 # ===============================
+metrics = report.metrics("pressure_metrics", state)
+
 st.markdown('<div class="section-metrics">', unsafe_allow_html=True)
 c1, c2, c3 = st.columns(3)
 
 with c1:
     st.metric(
-        "Total Biometric Updates (AP)",
-        f"{int(df['Biometric_Updates'].sum()):,}"
+        f"Total Biometric Updates ({state})",
+        f"{metrics['Biometric_Updates']:,}"
     )
 
 with c2:
     st.metric(
-        "Total Demographic Updates (AP)",
-        f"{int(df['Demographic_Updates'].sum()):,}"
+        f"Total Demographic Updates ({state})",
+        f"{metrics['Demographic_Updates']:,}"
     )
 
 with c3:
     st.metric(
         "Districts Covered",
-        df.shape[0]
+        metrics["Districts"]
     )
 
+# Raw totals mirror population size; per-capita load compares states fairly
+per_capita = report.metrics("per_capita_metrics", state)
+
+if per_capita["Rank"] is None:
+    st.caption(f"No population figure found for {state}, so per-capita pressure is not shown.")
+else:
+    p1, p2, p3 = st.columns(3)
+
+    with p1:
+        st.metric(
+            "Updates per 1,000 Residents",
+            f"{per_capita['Per_1000']:,.1f}",
+            help="Biometric + demographic updates over the data window, per 1,000 residents (2024 population)"
+        )
+
+    with p2:
+        st.metric(
+            "Per-Capita Rank",
+            f"{per_capita['Rank']} of {per_capita['States']}"
+        )
+
+    with p3:
+        st.metric(
+            "Vs Average of All States",
+            f"{per_capita['Index'] - 100:+.0f}%",
+            help="Per-capita load relative to all states in the data taken together"
+        )
+
 st.markdown('</div>', unsafe_allow_html=True)
 st.divider()
 
 # ===============================
 # TOP DISTRICTS BAR CHART
 # ===============================
-top_n = 15
-top_df = df.head(top_n)
-
 st.markdown("""
 <div class="chart-title">
 Top Districts by Aadhaar Update Load
@@ -139,35 +123,15 @@ A small number of districts handle a disproportionate share of updates
 </div>
 """, unsafe_allow_html=True)
 
-fig1 = px.bar(
-    top_df,
-    x="Total_Updates",
-    y="district",
-    orientation="h",
-    color="Total_Updates",
-    color_continuous_scale="Blues"
-)
-
-fig1.update_layout(
-    height=500,
-    yaxis_title="District",
-    xaxis_title="Total Updates",
-    coloraxis_showscale=False
-)
+fig1 = report.figure("top_districts", state)
 
-st.plotly_chart(fig1, use_container_width=True)
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig1, use_container_width=True)
 st.divider()
 
 # ===============================
 # BIOMETRIC VS DEMOGRAPHIC (DISTRICT)
 # ===============================
-stack_df = top_df.melt(
-    id_vars="district",
-    value_vars=["Biometric_Updates", "Demographic_Updates"],
-    var_name="Update Type",
-    value_name="Count"
-)
-
 st.markdown("""
 <div class="chart-title">
 Biometric vs Demographic Pressure by District
@@ -178,31 +142,107 @@ Different districts exhibit different identity update dynamics
 </div>
 """, unsafe_allow_html=True)
 
-fig2 = px.bar(
-    stack_df,
-    x="Count",
-    y="district",
-    color="Update Type",
-    orientation="h"
-)
+fig2 = report.figure("district_mix", state)
 
-fig2.update_layout(
-    height=500,
-    xaxis_title="Number of Updates",
-    yaxis_title="District",
-    legend_title_text=""
-)
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig2, use_container_width=True)
+st.divider()
+
+# ===============================
+# PINCODE DRILL-DOWN (PINCODE INDEX; FRAGMENT: ITS WIDGETS RERUN ONLY THIS SECTION)
+# ===============================
+st.markdown("""
+<div class="chart-title">
+Pincode Drill-Down
+</div>
+
+<div class="chart-subtitle">
+The busiest pincodes within a district — the level at which centres are staffed
+</div>
+""", unsafe_allow_html=True)
+
+
+@st.fragment
+def pincode_drilldown(state, districts):
+    with timing.fragment("05_District_Pressure_AP/pincodes"):
+        d1, d2 = st.columns([2, 1])
+
+        with d1:
+            district = st.selectbox("District", districts)
+
+        with d2:
+            window = st.slider("Last N days", min_value=7, max_value=90, value=30, step=1)
+
+        pin_df = top_pincodes(state, district, k=50, days=window)
+
+        if pin_df.empty:
+            st.info(f"No pincode-level updates for {district} in the last {window} days.")
+            return
+
+        pin_df["pincode"] = pin_df["pincode"].astype(str)
+
+        fig3 = figures.top_pincodes(pin_df)
+
+        with timing.stage("plotly_chart"):
+            st.plotly_chart(fig3, use_container_width=True)
 
-st.plotly_chart(fig2, use_container_width=True)
+        with st.expander(f"Top {len(pin_df)} pincodes in {district}"):
+            st.dataframe(pin_df, use_container_width=True, hide_index=True)
+
+
+pincode_drilldown(state, df["district"].tolist())
+
+st.divider()
+
+# ===============================
+# SURGE ALERTS (INCREMENTAL DETECTOR)
+# ===============================
+alert_days = 30
+
+st.markdown(f"""
+<div class="chart-title">
+Recent Surge Alerts
+</div>
+
+<div class="chart-subtitle">
+District-days in the last {alert_days} days of data where load broke from its recent pattern
+(robust z-score, EWMA control chart or CUSUM)
+</div>
+""", unsafe_allow_html=True)
+
+state_alerts = report.table("recent_surges", state)
+
+if state_alerts.empty:
+    st.info(
+        f"No surges flagged in {state} over the last {alert_days} days of data. "
+        "Alerts are refreshed by `python build_report.py` after each merge."
+    )
+else:
+    st.dataframe(
+        state_alerts[
+            ["date", "district", "Updates", "Expected", "Robust_Z", "CUSUM", "Detectors"]
+        ],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "date": st.column_config.DateColumn("Date"),
+            "district": "District",
+            "Updates": st.column_config.NumberColumn("Updates", format="%.0f"),
+            "Expected": st.column_config.NumberColumn("Expected", format="%.0f"),
+            "Robust_Z": st.column_config.NumberColumn("Robust z", format="%.1f"),
+            "CUSUM": st.column_config.NumberColumn("CUSUM", format="%.1f"),
+            "Detectors": "Flagged By",
+        },
+    )
 
 # ===============================
 # INSIGHT BOX
 # ===============================
-st.markdown("""
+st.markdown(f"""
 <div class="insight-box">
     <h4>Key Insight</h4>
     <p>
-    Aadhaar update demand in Andhra Pradesh is <b>highly concentrated</b> in a limited
+    Aadhaar update demand in {state} is <b>highly concentrated</b> in a limited
     set of districts. These districts experience sustained pressure due to population density,
     mobility, and service dependency.
     <br><br>
@@ -221,5 +261,7 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/06_Pressure_Deep_Dive.py")
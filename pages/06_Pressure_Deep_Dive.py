@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-import plotly.express as px
+
+from analytics import assets, report, timing, ui
 
 # ===============================
 # PAGE CONFIG
@@ -11,14 +10,21 @@ st.set_page_config(
     layout="wide"
 )
 
+timing.start("06_Pressure_Deep_Dive")
+
 # ===============================
 # LOAD CSS
 # ===============================
-base_css = Path("styles/base.css").read_text(encoding="utf-8")
-section_css = Path("styles/section3.css").read_text(encoding="utf-8")
+css = assets.stylesheet("base.css", "section3.css")
+
+st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
-st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>", unsafe_allow_html=True)
+timing.mark("css")
+
+# ===============================
+# STATE SELECTOR (SHARED BY PAGES 05–06)
+# ===============================
+state = ui.state_selector()
 
 # ===============================
 # PAGE HEADER
@@ -36,46 +42,22 @@ Why a small number of districts dominate Aadhaar update demand
 st.divider()
 
 # ===============================
-# LOAD DATA (ANDHRA PRADESH ONLY)
-# ===============================
-data_path = Path("data")
-
-# ✔ Biometric + Demographic sampled state datasets
-bio = pd.read_csv(data_path / "biometric_states" / "andra.csv")
-demo = pd.read_csv(data_path / "Demographic_states" / "andra_pradesh.csv")
-
-# ===============================
-# AUTO COLUMN DETECTION
-# ===============================
-bio_cols = [c for c in bio.columns if c.startswith("bio_age")]
-demo_cols = [c for c in demo.columns if c.startswith("demo_age")]
-
-# ===============================
-# AGGREGATION — DISTRICT LEVEL
+# AGGREGATION — DISTRICT LEVEL (PRECOMPUTED REPORT OR DISK-CACHED)
 # ===============================
-bio["Biometric_Updates"] = bio[bio_cols].sum(axis=1)
-demo["Demographic_Updates"] = demo[demo_cols].sum(axis=1)
-
-bio_d = bio.groupby("district", as_index=False)["Biometric_Updates"].sum()
-demo_d = demo.groupby("district", as_index=False)["Demographic_Updates"].sum()
+# Ranked districts with Cumulative_Share / District_Rank already attached
+df = report.table("concentration_curve", state)
 
-df = pd.merge(bio_d, demo_d, on="district", how="inner")
-df["Total_Updates"] = df["Biometric_Updates"] + df["Demographic_Updates"]
-
-df = df.sort_values("Total_Updates", ascending=False).reset_index(drop=True)
+if df.empty:
+    st.warning(f"No {state} districts with both biometric and demographic data.")
+    st.stop()
 
 # ===============================
 # CONCENTRATION METRICS
 # ===============================
-total_updates = df["Total_Updates"].sum()
-top_20_cutoff = max(1, int(len(df) * 0.2))
-
-top_20_share = (
-    df.head(top_20_cutoff)["Total_Updates"].sum() / total_updates * 100
-)
+# Top-20% share, Gini and HHI for every state, computed in one batched pass
+metrics = report.metrics("concentration_metrics", state)
 
-bio_ratio = df["Biometric_Updates"].sum() / total_updates * 100
-demo_ratio = 100 - bio_ratio
+timing.mark("load")
 
 # ===============================
 # METRICS
@@ -87,20 +69,20 @@ c1, c2, c3 = st.columns(3)
 with c1:
     st.metric(
         "Top 20% Districts Handle",
-        f"{top_20_share:.1f}%",
+        f"{metrics['Top_20_Share']:.1f}%",
         help="Share of total Aadhaar updates concentrated in top 20% districts"
     )
 
 with c2:
     st.metric(
         "Biometric Update Share",
-        f"{bio_ratio:.1f}%"
+        f"{metrics['Biometric_Share']:.1f}%"
     )
 
 with c3:
     st.metric(
         "Demographic Update Share",
-        f"{demo_ratio:.1f}%"
+        f"{metrics['Demographic_Share']:.1f}%"
     )
 
 st.markdown('</div>', unsafe_allow_html=True)
@@ -109,34 +91,65 @@ st.divider()
 # ===============================
 # DOMINANCE / CONCENTRATION CURVE
 # ===============================
-df["Cumulative_Share"] = df["Total_Updates"].cumsum() / total_updates * 100
-df["District_Rank"] = df.index + 1
-
-fig = px.line(
-    df,
-    x="District_Rank",
-    y="Cumulative_Share",
-    labels={
-        "District_Rank": "District Rank (High → Low Pressure)",
-        "Cumulative_Share": "Cumulative % of Total Updates"
-    }
-)
 
-fig.update_layout(
-    height=420,
-    showlegend=False
-)
+fig = report.figure("concentration_figure", state)
+
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig, use_container_width=True)
+st.divider()
+
+# ===============================
+# CONCENTRATION ACROSS STATES
+# ===============================
+st.markdown(f"""
+<div class="chart-title">
+How Concentrated Is {state} Compared With Other States?
+</div>
+
+<div class="chart-subtitle">
+Gini coefficient of district update load — 0 is perfectly even, values towards 1 mean a few districts carry most of it
+</div>
+""", unsafe_allow_html=True)
+
+fig2 = report.figure("gini_ranking", state)
+
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig2, use_container_width=True)
+st.divider()
+
+# ===============================
+# PER-CAPITA PRESSURE ACROSS STATES (POPULATION-ADJUSTED)
+# ===============================
+st.markdown(f"""
+<div class="chart-title">
+Per-Capita Update Pressure — Where Does {state} Stand?
+</div>
+
+<div class="chart-subtitle">
+Updates per 1,000 residents (2024 population) — raw totals mostly mirror population size; this compares states on equal footing
+</div>
+""", unsafe_allow_html=True)
+
+fig3 = report.figure("per_capita_ranking", state)
 
-st.plotly_chart(fig, use_container_width=True)
+with timing.stage("plotly_chart"):
+    st.plotly_chart(fig3, use_container_width=True)
+
+unmatched = report.metrics("per_capita_coverage")["Unmatched"]
+
+if unmatched:
+    st.caption(
+        f"Not ranked — no population figure in state_population.csv for: {', '.join(unmatched)}."
+    )
 
 # ===============================
 # INSIGHT
 # ===============================
-st.markdown("""
+st.markdown(f"""
 <div class="insight-box">
 <h4>Key Insight</h4>
 <p>
-A small fraction of districts in Andhra Pradesh accounts for a
+A small fraction of districts in {state} accounts for a
 <strong>disproportionately large share of Aadhaar update activity</strong>.
 <br><br>
 This concentration is not random — it reflects structural realities:
@@ -157,5 +170,7 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/07_Predictive_Insight.py")
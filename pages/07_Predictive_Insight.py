@@ -1,16 +1,27 @@
 import streamlit as st
-from pathlib import Path
+import pandas as pd
+
+from analytics import assets, report, timing
+from analytics.forecast import MODELS
+
+MODEL_LABELS={
+"seasonal_naive":"Seasonal naive",
+"exp_smoothing":"Exponential smoothing",
+"rolling_regression":"Rolling regression",
+}
 
 st.set_page_config(
 page_title="Predictive Insight | Aadhaar Data Intelligence",
 layout="wide"
 )
 
-base_css=Path("styles/base.css").read_text(encoding="utf-8")
-section_css=Path("styles/section4.css").read_text(encoding="utf-8")
+timing.start("07_Predictive_Insight")
+
+css=assets.stylesheet("base.css","section4.css")
+
+st.markdown(f"<style>{css}</style>",unsafe_allow_html=True)
 
-st.markdown(f"<style>{base_css}</style>",unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>",unsafe_allow_html=True)
+timing.mark("css")
 
 st.markdown("""
 <div class="gov-hero">
@@ -133,6 +144,70 @@ High-pressure phases tend to <b>repeat</b>, not dissipate.
 </div>
 """,unsafe_allow_html=True)
 
+st.markdown("""
+<div class="gov-section">
+<h2>Live Forecast</h2>
+<p>
+Next-month update load projected from the observed monthly series,
+with a <b>95% prediction interval</b>.
+</p>
+</div>
+""",unsafe_allow_html=True)
+
+# Fragment: switching the model reruns only the forecast section
+@st.fragment
+def live_forecast():
+    with timing.fragment("07_Predictive_Insight/forecast"):
+        model=st.radio("Forecast model",MODELS,index=MODELS.index("exp_smoothing"),format_func=MODEL_LABELS.get,horizontal=True)
+
+        nxt=report.metrics("forecast_metrics",model)
+
+        c1,c2,c3=st.columns(3)
+
+        with c1:
+            st.metric(f"Forecast Updates ({pd.Period(nxt['Month']).strftime('%b %Y')})",f"{nxt['Forecast']:,.0f}")
+
+        with c2:
+            st.metric("95% Interval",f"{nxt['Lower']/1e6:,.1f}M – {nxt['Upper']/1e6:,.1f}M")
+
+        with c3:
+            st.metric("Change vs Last Month",f"{nxt['Change_Pct']:+.1f}%")
+
+        fig=report.figure("national_forecast",model)
+
+        with timing.stage("plotly_chart"):
+            st.plotly_chart(fig,use_container_width=True)
+
+        dist_df=report.table("district_forecasts",model)
+
+        if not dist_df.empty:
+            st.markdown(f"""
+<div class="gov-section">
+<h4>Districts Expected Under Most Pressure ({dist_df['Month'].iloc[0]})</h4>
+<p class="muted">
+{len(dist_df):,} district series fitted in one batch; monthly totals are scaled for partially reported months.
+</p>
+</div>
+""",unsafe_allow_html=True)
+
+            st.dataframe(
+            dist_df.head(20)[["state","district","Last","Forecast","Lower","Upper","Change_Pct"]],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+            "state":"State",
+            "district":"District",
+            "Last":st.column_config.NumberColumn("Last Month",format="%.0f"),
+            "Forecast":st.column_config.NumberColumn("Forecast",format="%.0f"),
+            "Lower":st.column_config.NumberColumn("Lower (95%)",format="%.0f"),
+            "Upper":st.column_config.NumberColumn("Upper (95%)",format="%.0f"),
+            "Change_Pct":st.column_config.NumberColumn("Change %",format="%+.1f%%"),
+            },
+            )
+
+
+live_forecast()
+
 st.markdown("""
 <div class="gov-section">
 <h2>Why This Has Predictive Value</h2>
@@ -180,5 +255,7 @@ Page 8 — Governance Controls & Global-Inspired Solutions
 </div>
 """,unsafe_allow_html=True)
 
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/08_Governance_Implications.py")
@@ -1,16 +1,19 @@
 import streamlit as st
-from pathlib import Path
+
+from analytics import assets, timing
 
 st.set_page_config(
 page_title="Governance Implications | Aadhaar Data Intelligence",
 layout="wide"
 )
 
-base_css=Path("styles/base.css").read_text(encoding="utf-8")
-section_css=Path("styles/section5.css").read_text(encoding="utf-8")
+timing.start("08_Governance_Implications")
+
+css=assets.stylesheet("base.css","section5.css")
 
-st.markdown(f"<style>{base_css}</style>",unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>",unsafe_allow_html=True)
+st.markdown(f"<style>{css}</style>",unsafe_allow_html=True)
+
+timing.mark("css")
 
 st.markdown("""
 <div class="gov-hero">
@@ -190,5 +193,7 @@ Page 9 — Final Conclusions, Limitations & Future Scope
 </div>
 """,unsafe_allow_html=True)
 
+timing.finish()
+
 if st.button("»", key="next_page"):
     st.switch_page("pages/09_Conclusion_Limitations.py")
\ No newline at end of file
@@ -1,16 +1,19 @@
 import streamlit as st
-from pathlib import Path
+
+from analytics import assets, timing
 
 st.set_page_config(
 page_title="Conclusion | Aadhaar Data Intelligence",
 layout="wide"
 )
 
-base_css=Path("styles/base.css").read_text(encoding="utf-8")
-section_css=Path("styles/section6.css").read_text(encoding="utf-8")
+timing.start("09_Conclusion_Limitations")
+
+css=assets.stylesheet("base.css","section6.css")
 
-st.markdown(f"<style>{base_css}</style>",unsafe_allow_html=True)
-st.markdown(f"<style>{section_css}</style>",unsafe_allow_html=True)
+st.markdown(f"<style>{css}</style>",unsafe_allow_html=True)
+
+timing.mark("css")
 
 st.markdown("""
 <div class="gov-hero">
@@ -104,3 +107,5 @@ st.markdown("""
 <b>— ---THANK YOU----- —</b>
 </div>
 """,unsafe_allow_html=True)
+
+timing.finish()